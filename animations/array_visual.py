@@ -18,7 +18,7 @@ from manim import (
 )
 from numpy import array
 
-from user_array import my_array
+from job_spec import load_array
 
 
 def GenerateArrayVisual(
@@ -85,7 +85,7 @@ class ProceduralArrayVisual(Scene):
 
     def construct(self):
         # some_array = [55, 86, 98, 72, 21, 13, 64]
-        some_array = my_array
+        some_array = load_array()
         array_vr = GenerateArrayVisual(some_array, LEFT * 6)
         self.play(Write(array_vr), run_time=4)
         self.play(array_vr.animate.center())
@@ -0,0 +1,224 @@
+"""Bar chart view that stays fast for hundreds or thousands of elements.
+
+The cell scenes build a square and a label per element and a few plays
+per comparison, which is fine for 8 items and hopeless for 1000. Here
+the array lives in a NumPy array and all bars are drawn by three
+VMobjects (plain, highlighted, sorted) whose points are recomputed from
+it in one vectorized step. The whole trace is played by a single
+updater-driven animation, so manim writes one partial movie per video.
+"""
+
+import math
+
+import numpy as np
+from manim import (
+    BLUE,
+    GREEN,
+    UP,
+    WHITE,
+    YELLOW,
+    Scene,
+    Text,
+    UpdateFromAlphaFunc,
+    VGroup,
+    VMobject,
+    config,
+    linear,
+)
+
+from job_spec import load_array, load_job
+from profiler import PROFILER
+from render_events import RenderEvents
+from sort_trace import (
+    apply_to_bars,
+    bubble_sort_trace,
+    insertion_sort_trace,
+    selection_sort_trace,
+)
+
+# Offsets of the 4 points of a straight cubic Bezier segment
+_LINE_T = np.array([0.0, 1.0 / 3.0, 2.0 / 3.0, 1.0])
+
+
+def bar_points(x0, x1, y0, y1):
+    """Outline points of many rectangles at once, as one VMobject path.
+
+    Every bar becomes its own closed subpath of 4 straight segments.
+    """
+    corners = np.stack(
+        [
+            np.stack([x0, y0], axis=-1),
+            np.stack([x1, y0], axis=-1),
+            np.stack([x1, y1], axis=-1),
+            np.stack([x0, y1], axis=-1),
+        ],
+        axis=1,
+    )  # (bars, 4, 2)
+    ends = np.roll(corners, -1, axis=1)
+    segments = (
+        corners[:, :, None, :]
+        + (ends - corners)[:, :, None, :] * _LINE_T[None, None, :, None]
+    )  # (bars, 4 segments, 4 points, 2)
+    points = np.zeros((segments.shape[0] * 16, 3))
+    points[:, :2] = segments.reshape(-1, 2)
+    return points
+
+
+class ArrayBars(VGroup):
+    """Bars for every value of an array, redrawn from NumPy state."""
+
+    def __init__(self, values, width=12.0, height=5.0, **kwargs):
+        super().__init__(**kwargs)
+        self.values = np.asarray(values, dtype=float)
+        self.highlighted = np.zeros(len(self.values), dtype=bool)
+        self.done = np.zeros(len(self.values), dtype=bool)
+        self.chart_width = width
+        self.chart_height = height
+        self.low = min(self.values.min(initial=0.0), 0.0)
+        self.high = max(self.values.max(initial=1.0), self.low + 1e-9)
+        self.key = None
+
+        self.plain, self.lit, self.finished = (
+            VMobject(fill_color=color, fill_opacity=1, stroke_width=0)
+            for color in (BLUE, YELLOW, GREEN)
+        )
+        self.add(self.plain, self.lit, self.finished)
+        self.refresh()
+
+    def refresh(self):
+        n = len(self.values)
+        if n == 0:
+            return
+        slot = self.chart_width / n
+        gap = 0.15 * slot if n <= 200 else 0.0
+        x0 = -self.chart_width / 2 + np.arange(n) * slot
+        x1 = x0 + slot - gap
+        # Keep a sliver for the smallest value so every bar is visible
+        span = self.high - self.low
+        heights = 0.02 + (self.values - self.low) / span * self.chart_height
+        y0 = np.full(n, -self.chart_height / 2 - 0.5)
+        y1 = y0 + heights
+
+        for layer, mask in (
+            (self.plain, ~self.highlighted & ~self.done),
+            (self.lit, self.highlighted),
+            (self.finished, self.done & ~self.highlighted),
+        ):
+            if mask.any():
+                layer.set_points(
+                    bar_points(x0[mask], x1[mask], y0[mask], y1[mask])
+                )
+            else:
+                layer.set_points(np.zeros((0, 3)))
+
+    def apply(self, events):
+        """Apply trace events; the cells they touch end up highlighted."""
+        apply_to_bars(self, events)
+
+
+class BarSortScene(Scene):
+    TITLE = ""
+
+    def setup(self):
+        super().setup()
+        self.job = load_job()
+        if self.job.get("profile"):
+            PROFILER.start(self.job["profile"])
+            self.hook_profiler()
+        else:
+            PROFILER.stop()  # e.g. after a profiled job that failed
+
+    def hook_profiler(self):
+        """Time every frame and the final encode, like SortScene does."""
+        writer = self.renderer.file_writer
+        self.renderer.update_frame = PROFILER.timed(
+            "rasterize", self.renderer.update_frame
+        )
+        writer.write_frame = PROFILER.timed(
+            "write", writer.write_frame, frame=True
+        )
+        finish = writer.finish
+
+        def profiled_finish(*args, **kwargs):
+            with PROFILER.span("encode"):
+                result = finish(*args, **kwargs)
+            PROFILER.save(
+                scene=type(self).__name__,
+                quality=f"{config.pixel_height}p{config.frame_rate:g}",
+            )
+            return result
+
+        writer.finish = profiled_finish
+
+    def play(self, *animations, **kwargs):
+        with PROFILER.play(animations):
+            super().play(*animations, **kwargs)
+
+    def trace(self, values):
+        raise NotImplementedError
+
+    def construct(self):
+        job = self.job
+        events_out = RenderEvents(job.get("progress"))
+        values = load_array(job)
+        events = self.trace(values)
+
+        title = Text(f"{self.TITLE} (n={len(values)})", font_size=32)
+        title.set_color(WHITE).to_edge(UP)
+        bars = ArrayBars(values)
+        self.add(title, bars)
+        events_out.emit("plan", animations=2)
+
+        # Spread the trace over the video, several events per frame
+        seconds = job.get("target_seconds") or min(
+            max(len(events) * 0.05, 5.0), 60.0
+        )
+        per_frame = max(
+            1, math.ceil(len(events) / (seconds * config.frame_rate))
+        )
+        applied = 0
+
+        def advance(mob, alpha):
+            nonlocal applied
+            upto = min(len(events), math.ceil(alpha * len(events)))
+            if upto == applied:
+                return
+            # Whole frames' worth of events, so highlights stay readable
+            upto = max(upto, min(len(events), applied + per_frame))
+            mob.apply(events[applied:upto])
+            mob.refresh()
+            applied = upto
+
+        self.play(
+            UpdateFromAlphaFunc(bars, advance),
+            run_time=seconds,
+            rate_func=linear,
+        )
+        events_out.emit("animation", index=1)
+
+        bars.done[:] = True
+        bars.highlighted[:] = False
+        bars.refresh()
+        self.wait(1)
+        events_out.emit("animation", index=2)
+
+
+class BubbleSortBars(BarSortScene):
+    TITLE = "Bubble Sort"
+
+    def trace(self, values):
+        return bubble_sort_trace(values)
+
+
+class SelectionSortBars(BarSortScene):
+    TITLE = "Selection Sort"
+
+    def trace(self, values):
+        return selection_sort_trace(values)
+
+
+class InsertionSortBars(BarSortScene):
+    TITLE = "Insertion Sort"
+
+    def trace(self, values):
+        return insertion_sort_trace(values)
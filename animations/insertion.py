@@ -4,40 +4,47 @@ from manim import (
     RIGHT,
     UP,
     Integer,
-    Scene,
     Square,
     Transform,
     Unwrite,
     VGroup,
     Write,
 )
-from user_array import my_array
+from job_spec import load_array
+from labels import LABELS
+from sort_scene import SortScene
+from sort_trace import insertion_sort_trace
 
 
 class ArrayItem:
     def __init__(self, value):
         self.value = value
         self.square = Square(side_length=1)
-        self.text = Integer(value)
+        self.text = LABELS.get(Integer, value)
 
 
-class InsertionSort(Scene):
+class InsertionSort(SortScene):
+    PLAY_COSTS = {"lift": 2, "shift": 2, "insert": 3, "rearrange": 1}
+    COMPACT_PLAY_COSTS = PLAY_COSTS
+    OUTRO_PLAYS = 2
+
     def construct(self):
         # initialize the array
-        data = my_array
+        data = load_array(self.job)
 
         # transform the array into ArrayItems
-        dArray = []
+        self.dArray = dArray = []
         for el in data:
             dArray.append(ArrayItem(el))
 
         # create the VGroup for Manim rendering
-        gArray = VGroup()
+        self.gArray = gArray = VGroup()
         # add the squares
         for el in dArray:
             gArray.add(VGroup().add_to_back(el.square).add(el.text))
         # arrange them
         gArray.arrange(buff=0)
+        self.slots = [el.get_center() for el in gArray]
         # add the texts
         # for el in range(len(dArray)):
         # gArray.add(dArray[el].text.align_to(dArray[el].square))
@@ -46,37 +53,56 @@ class InsertionSort(Scene):
         self.wait(1)
 
         # sort
-        for step in range(1, len(dArray)):
-            aux = dArray[step].value
-            auxEl = gArray[step].copy()
-            self.add(auxEl)
-            self.play(auxEl.animate(run_time=0.3).shift(DOWN * 1))
-            # Loop through all previous items
-            j = step - 1
-            self.play(auxEl.animate(run_time=0.3).shift(LEFT * 1))
-            # Compare aux with each element on the left of it until an element smaller than it is found
-            while j >= 0 and aux < dArray[j].value:
-                newInteger = (
-                    VGroup()
-                    .add_to_back(Square(side_length=1))
-                    .add(Integer(dArray[j].value))
-                )
-                self.play(
-                    Transform(
-                        gArray[j + 1],
-                        newInteger.match_x(gArray[j + 1]),
-                        run_time=0.3,
-                    )
-                )
-                dArray[j + 1].value = dArray[j].value
-                self.play(auxEl.animate(run_time=0.3).shift(LEFT * 1))
-                j = j - 1
-            # Place key at after the element just smaller than it.
-            self.play(auxEl.animate(run_time=0.3).shift(RIGHT * 1))
-            self.play(Unwrite(gArray[j + 1], run_time=0.3))
-            gArray[j + 1] = auxEl
-            self.play(gArray[j + 1].animate(run_time=0.3).shift(UP * 1))
-            dArray[j + 1].value = aux
+        self.play_trace(insertion_sort_trace(data), len(data))
 
         self.wait(1)
         self.play(Unwrite(gArray, lag_ratio=0.1, reverse=False))
+
+    def on_lift(self, index):
+        self.aux = self.dArray[index].value
+        self.auxEl = self.gArray[index].copy()
+        self.add(self.auxEl)
+        self.play(self.auxEl.animate(run_time=0.3).shift(DOWN * 1))
+        self.play(self.auxEl.animate(run_time=0.3).shift(LEFT * 1))
+
+    def on_compare(self, a, b, smaller):
+        # Comparing with the key only shows up as the shifts that follow
+        pass
+
+    def on_shift(self, src, dst):
+        newInteger = (
+            VGroup()
+            .add_to_back(Square(side_length=1))
+            .add(LABELS.get(Integer, self.dArray[src].value))
+        )
+        self.play(
+            Transform(
+                self.gArray[dst],
+                newInteger.match_x(self.gArray[dst]),
+                run_time=0.3,
+            )
+        )
+        self.dArray[dst].value = self.dArray[src].value
+        self.play(self.auxEl.animate(run_time=0.3).shift(LEFT * 1))
+
+    def on_insert(self, index):
+        # Place key at after the element just smaller than it.
+        self.play(self.auxEl.animate(run_time=0.3).shift(RIGHT * 1))
+        self.play(Unwrite(self.gArray[index], run_time=0.3))
+        self.gArray[index] = self.auxEl
+        self.play(self.gArray[index].animate(run_time=0.3).shift(UP * 1))
+        self.dArray[index].value = self.aux
+
+    def on_rearrange(self, order, sorted_cells):
+        moved = [self.gArray[k] for k in order]
+        values = [self.dArray[k].value for k in order]
+        animations = [
+            el.animate(run_time=0.6).move_to(self.slots[k])
+            for k, el in enumerate(moved)
+            if el is not self.gArray[k]
+        ]
+        for k, el in enumerate(moved):
+            self.gArray[k] = el
+            self.dArray[k].value = values[k]
+        if animations:
+            self.play(*animations)
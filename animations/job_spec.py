@@ -0,0 +1,38 @@
+"""Per-job settings handed to the scenes.
+
+Whoever launches manim (the GUI, the render worker or the batch command)
+puts a JSON object into the SORTFLOW_JOB environment variable, e.g.
+``{"compact": true, "array": [3, 1, 2]}``. Scenes rendered without it
+use the defaults.
+
+The array to sort is part of the job spec, so renders running at the
+same time never share an input file. When it is missing (e.g. running
+``manim bubble.py`` by hand) a user_array.py next to the scenes with a
+``my_array`` list is used if there is one.
+"""
+
+import importlib
+import json
+import os
+
+JOB_ENV = "SORTFLOW_JOB"
+
+
+def load_job():
+    raw = os.environ.get(JOB_ENV)
+    return json.loads(raw) if raw else {}
+
+
+DEFAULT_ARRAY = [5, 3, 8, 1, 4]
+
+
+def load_array(job=None):
+    """The array to sort, as a fresh list the scene may change."""
+    job = load_job() if job is None else job
+    if "array" in job:
+        return list(job["array"])
+    try:
+        user_array = importlib.import_module("user_array")
+    except ImportError:
+        return list(DEFAULT_ARRAY)
+    return list(user_array.my_array)
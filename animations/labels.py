@@ -0,0 +1,67 @@
+"""Process-wide cache of label mobjects.
+
+Building a ``MathTex`` compiles LaTeX and building a ``Text`` lays out
+glyphs with Pango, which adds up when the scenes create a fresh label
+for every cell and every pointer move. The cache keeps one built mobject
+per (class, string, settings) and hands out copies, so every label is
+only built once per process; the render worker keeps it across jobs.
+Other constant mobjects, like the code panel in sort_scene.py, go
+through ``build`` with a key of their own.
+"""
+
+import time
+from collections import OrderedDict
+
+from profiler import PROFILER
+
+
+class LabelCache:
+    """LRU cache of built labels; ``get`` always returns a fresh copy."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.build_seconds = 0.0
+
+    def get(self, cls, text, **settings):
+        """A copy of ``cls(text, **settings)``, e.g. font, size or color."""
+        key = (
+            cls.__name__,
+            str(text),
+            tuple(sorted((name, str(v)) for name, v in settings.items())),
+        )
+        return self.build(key, lambda: cls(text, **settings))
+
+    def build(self, key, factory):
+        """A copy of what ``factory()`` builds, built once per ``key``.
+
+        ``key[0]`` names what is built in the profiler trace, ``key[1]``
+        is the text it is built from.
+        """
+        mobject = self.entries.get(key)
+        if mobject is None:
+            self.misses += 1
+            start = time.perf_counter()
+            with PROFILER.span(f"build {key[0]}", text=str(key[1])):
+                mobject = factory()
+            self.build_seconds += time.perf_counter() - start
+            self.entries[key] = mobject
+            if len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+        else:
+            self.hits += 1
+            self.entries.move_to_end(key)
+        return mobject.copy()
+
+    def stats(self):
+        return {
+            "entries": len(self.entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "build_seconds": round(self.build_seconds, 3),
+        }
+
+
+LABELS = LabelCache()
@@ -0,0 +1,197 @@
+"""Opt-in profiler for the sorting scenes, exported as a Chrome trace.
+
+With ``"profile": "<path>"`` in the job spec, SortScene times every
+play and wait and writes a trace that chrome://tracing and
+https://ui.perfetto.dev open directly. Every play is one slice, tagged
+with the helper that issued it (``justHighlight``, ``on_swap``, ...),
+the animations it ran and where in the trace it happened (pass, event
+index and op). Inside it, every frame shows up as a ``rasterize`` slice
+(the camera drawing the mobjects) and a ``write`` slice (handing the
+frame to the encoder). The time since the previous play is a
+``construct`` slice, which is where new mobjects are built; label cache
+misses show up in there as ``build MathTex`` and the like.
+
+The bar scenes in bars.py and sortflow/raster.py record the same
+per-frame slices; the raster engine has no plays, so one ``render``
+slice stands for the whole video there.
+
+Relative paths are resolved against the repository root, like the
+progress events in render_events.py.
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANIMATIONS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Plumbing between a helper and manim, never the interesting caller
+PLUMBING = {
+    "play",
+    "wait",
+    "defer",
+    "flush_pending",
+    "set_skipping",
+    "play_trace",
+}
+
+
+class Profiler:
+    """Collects trace events while a path is set, see ``start``."""
+
+    def __init__(self):
+        self.path = None
+        self.events = []
+
+    @property
+    def enabled(self):
+        return self.path is not None
+
+    def start(self, path):
+        """Profile from now on and write the trace to ``path`` on save."""
+        self.path = os.path.join(REPO_DIR, path)
+        self.events = []
+        self.origin = time.perf_counter()
+        self.last_end = self.origin
+        self.context = {}  # where in the trace we are, e.g. pass and op
+        self.depth = 0  # plays issued while a play is timed are nested
+        self.totals = None  # phase times of the play being timed
+
+    def _slice(self, name, start, end, **args):
+        self.events.append(
+            {
+                "name": name,
+                "ph": "X",
+                "ts": round((start - self.origin) * 1e6, 1),
+                "dur": round((end - start) * 1e6, 1),
+                "pid": os.getpid(),
+                "tid": 1,
+                "args": args,
+            }
+        )
+
+    @contextmanager
+    def span(self, name, **args):
+        """Time the block as one slice; does nothing when disabled."""
+        if not self.enabled:
+            yield
+            return
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._slice(name, start, time.perf_counter(), **args)
+
+    @contextmanager
+    def play(self, animations):
+        """Time a play or wait, plus the construction time before it."""
+        if not self.enabled or self.depth:
+            yield
+            return
+        start = time.perf_counter()
+        if start > self.last_end:
+            self._slice("construct", self.last_end, start, **self.context)
+        self.depth += 1
+        self.totals = {"rasterize": 0.0, "write": 0.0, "frames": 0}
+        stack = calling_helpers()
+        try:
+            yield
+        finally:
+            self.depth -= 1
+            end = time.perf_counter()
+            totals, self.totals = self.totals, None
+            self._slice(
+                stack[0] if stack else "construct",
+                start,
+                end,
+                helpers=" < ".join(stack),
+                animations=[type(a).__name__ for a in animations],
+                frames=totals["frames"],
+                rasterize_ms=round(totals["rasterize"] * 1000, 3),
+                write_ms=round(totals["write"] * 1000, 3),
+                # Whatever is left: interpolating the animations
+                animate_ms=round(
+                    (end - start - totals["rasterize"] - totals["write"])
+                    * 1000,
+                    3,
+                ),
+                **self.context,
+            )
+            self.last_end = end
+
+    def slice_since(self, name, start, **args):
+        """Add a slice from ``start`` (time.perf_counter) until now."""
+        if self.enabled:
+            self._slice(name, start, time.perf_counter(), **args)
+
+    def tag(self, **context):
+        """Add to what every following slice is tagged with."""
+        if self.enabled:
+            self.context.update(context)
+
+    def timed(self, phase, function, frame=False):
+        """Wrap ``function`` so every call is a ``phase`` slice.
+
+        ``phase`` is "rasterize" or "write"; ``frame`` says that every
+        call writes one frame.
+        """
+
+        def timed_function(*args, **kwargs):
+            if not self.enabled:
+                return function(*args, **kwargs)
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                end = time.perf_counter()
+                self._slice(phase, start, end)
+                if self.totals is not None:
+                    self.totals[phase] += end - start
+                    self.totals["frames"] += frame
+
+        return timed_function
+
+    def save(self, **metadata):
+        """Write the trace and stop profiling."""
+        if not self.enabled:
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(
+                {
+                    "traceEvents": self.events,
+                    "displayTimeUnit": "ms",
+                    "otherData": metadata,
+                },
+                f,
+            )
+        self.stop()
+
+    def stop(self):
+        """Stop profiling without writing anything."""
+        self.path = None
+        self.events = []
+
+
+def calling_helpers(limit=3):
+    """Names of the scene methods that led to this play, innermost first."""
+    helpers = []
+    frame = sys._getframe(1)
+    while frame is not None and len(helpers) < limit:
+        code = frame.f_code
+        if (
+            os.path.dirname(os.path.abspath(code.co_filename))
+            == ANIMATIONS_DIR
+            and code.co_name not in PLUMBING
+            and not code.co_name.startswith("<")  # lambdas, module level
+            and not code.co_filename.endswith("profiler.py")
+        ):
+            helpers.append(code.co_name)
+        frame = frame.f_back
+    return helpers
+
+
+PROFILER = Profiler()
@@ -0,0 +1,40 @@
+"""Machine readable progress events for whoever launched the render.
+
+When the job spec has a ``"progress"`` path, the scene appends one JSON
+object per line to that file:
+
+    {"event": "plan", "animations": 180}      planned number of plays
+    {"event": "animation", "index": 12, "frames": 290}
+    {"event": "segment", "index": 12, "path": ".../partial_movie_files/...",
+     "seconds": 0.4}                          a finished partial movie
+    {"event": "encode", "animations": 180, "frames": 4310}
+    {"event": "finished", "path": ".../BubbleSort.mp4", "labels": {...}}
+
+``labels`` holds the hit/miss counts of the label cache, see labels.py.
+The ``segment`` events, in order, are the video so far: played one
+after the other they show the same as the finished video will.
+
+Relative paths are resolved against the repository root, so the same job
+spec works on the host and inside the manim container.
+"""
+
+import json
+import os
+import time
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class RenderEvents:
+    def __init__(self, path=None):
+        self.file = None
+        if path:
+            path = os.path.join(REPO_DIR, path)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            self.file = open(path, "a", buffering=1)
+
+    def emit(self, event, **fields):
+        if self.file is None:
+            return
+        fields.update(event=event, time=time.time())
+        self.file.write(json.dumps(fields) + "\n")
@@ -0,0 +1,123 @@
+"""Partial movie files shared between renders of different arrays.
+
+Manim already skips a play when a partial movie file with the same
+content hash exists, and joins the partial movies with ffmpeg's concat
+demuxer without re-encoding them. But it only looks in the media folder
+of the current render, which is new for every batch job. Plays that do
+not depend on the input (title, code panel, first highlighted line) are
+kept here as well, by hash, so every later render of that scene at that
+quality reuses them. See SortScene.shared_segment.
+"""
+
+import fcntl
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SEGMENT_DIR = os.path.join(
+    os.environ.get("SORTFLOW_CACHE_DIR")
+    or os.path.join(REPO_DIR, ".sortflow_cache"),
+    "segments",
+)
+SEGMENT_MAX_BYTES = int(
+    os.environ.get("SORTFLOW_SEGMENT_MAX_BYTES", 512 * 1024**2)
+)
+
+
+class SegmentStore:
+    """Shared partial movies with LRU eviction, like sortflow's RenderCache.
+
+    ``<root>/index.json`` keeps the size and last use of every segment;
+    once they add up to more than ``max_bytes`` the least recently used
+    ones are removed. Renders in other processes share the folder, so
+    the index is read again under a file lock before every change.
+    """
+
+    def __init__(self, root=SEGMENT_DIR, max_bytes=SEGMENT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(root, "index.json")
+        self.lock_path = os.path.join(root, "index.lock")
+        self._lock = threading.Lock()
+        self._index = {}
+
+    @contextmanager
+    def _locked_index(self):
+        os.makedirs(self.root, exist_ok=True)
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._index = self._load_index()
+                yield self._index
+                self._save_index()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def path_for(self, key):
+        """``key`` is ``<output settings>/<manim play hash><extension>``."""
+        return os.path.join(self.root, key)
+
+    def fetch(self, key, destination):
+        """Copy the segment ``key`` to ``destination`` if we have it."""
+        with self._locked_index() as index:
+            entry = index.get(key)
+            if entry is None:
+                return False
+            try:
+                os.makedirs(os.path.dirname(destination), exist_ok=True)
+                shutil.copyfile(self.path_for(key), destination)
+            except FileNotFoundError:
+                del index[key]  # removed behind our back
+                return False
+            entry["last_used"] = time.time()
+            return True
+
+    def store(self, key, source):
+        path = self.path_for(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        shutil.copyfile(source, tmp_path)
+        os.replace(tmp_path, path)
+        with self._locked_index() as index:
+            index[key] = {
+                "size": os.path.getsize(path),
+                "last_used": time.time(),
+            }
+            self._evict(keep=key)
+
+    def total_bytes(self):
+        return sum(entry["size"] for entry in self._index.values())
+
+    def _evict(self, keep=None):
+        by_age = sorted(
+            self._index.items(), key=lambda item: item[1]["last_used"]
+        )
+        total = self.total_bytes()
+        for key, entry in by_age:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self.path_for(key))
+            except FileNotFoundError:
+                pass
+            total -= entry["size"]
+            del self._index[key]
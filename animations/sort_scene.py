@@ -0,0 +1,493 @@
+import os
+from contextlib import contextmanager
+
+from manim import (
+    DOWN,
+    LEFT,
+    PI,
+    RED,
+    RIGHT,
+    UP,
+    YELLOW,
+    AnimationGroup,
+    Code,
+    Create,
+    FadeIn,
+    FadeOut,
+    ReplacementTransform,
+    Scene,
+    Succession,
+    SurroundingRectangle,
+    Text,
+    Transform,
+    Triangle,
+    VGroup,
+    config,
+)
+from manim.mobject.text.text_mobject import remove_invisible_chars
+
+from job_spec import load_job
+from labels import LABELS
+from profiler import PROFILER
+from render_events import REPO_DIR, RenderEvents
+from segments import SegmentStore
+from sort_trace import chunk_bounds, summarize
+
+# How build_code_block draws the snippet; part of its cache key
+CODE_STYLE = {
+    "font_size": 18,
+    "tab_width": 4,
+    "language": "Python",
+    "background": "window",
+    "line_spacing": 0.6,
+    "insert_line_no": False,
+}
+
+
+def code_block(code_str):
+    """The code panel plus one hidden highlight rectangle per line."""
+    m_code = Code(code=code_str, **CODE_STYLE).to_edge(DOWN)
+    m_code.code = remove_invisible_chars(m_code.code)
+    sliding_wins = VGroup()
+    for line in m_code.code:
+        sliding_wins.add(
+            SurroundingRectangle(line).set_fill(YELLOW).set_opacity(0)
+        )
+    return VGroup(m_code, sliding_wins)
+
+
+class SortScene(Scene):
+    """Helpers shared by the sorting scenes plus the trace renderer.
+
+    Subclasses build their mobjects in ``construct`` and then call
+    ``play_trace`` with a trace from sort_trace.py. Every event
+    ``(op, *args)`` is handed to ``self.on_<op>(*args)``; the handlers
+    below cover the events that look the same in every scene.
+
+    With ``"compact": true`` in the job spec, small animations passed to
+    ``defer`` are not played on their own but chained in front of the
+    next ``play`` as one Succession, so manim writes one partial movie
+    file for the whole chain instead of one per step.
+
+    Progress is reported through render_events.py, including a
+    ``segment`` event for every partial movie file as soon as manim
+    finished writing it, so a player can start before the render ends.
+    ``PLAY_COSTS`` and ``COMPACT_PLAY_COSTS`` say roughly how many plays
+    each trace event takes, which is how the scene knows its total
+    before it starts. The same numbers let ``max_animations`` /
+    ``target_seconds`` in the job spec shorten long traces, see
+    sort_trace.summarize.
+
+    ``"profile": "<path>"`` in the job spec writes a Chrome trace of
+    where the render spent its time, see profiler.py.
+    """
+
+    PLAY_COSTS = {"line": 2, "pointer": 1, "rearrange": 1}
+    COMPACT_PLAY_COSTS = {"pointer": 1, "rearrange": 1}
+    OUTRO_PLAYS = 3  # plays after the trace, e.g. fading out the code
+
+    def setup(self):
+        super().setup()
+        self.global_animation_duration = 0.4
+        self.pointers = {}
+        self.slider_window = None
+        self.job = load_job()
+        if self.job.get("profile"):
+            PROFILER.start(self.job["profile"])
+        else:
+            PROFILER.stop()  # e.g. after a profiled job that failed
+        self.compact = self.job.get("compact", False)
+        self.pending_animations = []
+        self.events = RenderEvents(self.job.get("progress"))
+        self.frames_written = 0
+        self.segments_reported = 0
+        self.segments = SegmentStore()
+        self.in_shared_segment = False
+        # {"index": k, "count": K}: only render the k-th of K chunks
+        self.chunk = self.job.get("chunk")
+        self.hook_file_writer()
+        if self.chunk and self.chunk["index"] > 0:
+            self.set_skipping(True)  # the intro belongs to chunk 0
+
+    def hook_file_writer(self):
+        """Count written frames and report when the final encode runs."""
+        writer = self.renderer.file_writer
+        write_frame, finish = writer.write_frame, writer.finish
+
+        def counting_write_frame(*args, **kwargs):
+            self.frames_written += 1
+            return write_frame(*args, **kwargs)
+
+        def reporting_finish(*args, **kwargs):
+            self.events.emit(
+                "encode",
+                animations=self.renderer.num_plays,
+                frames=self.frames_written,
+            )
+            with PROFILER.span("encode"):
+                result = finish(*args, **kwargs)
+            PROFILER.save(
+                scene=type(self).__name__,
+                quality=f"{config.pixel_height}p{config.frame_rate:g}",
+                labels=LABELS.stats(),
+            )
+            self.events.emit(
+                "finished",
+                path=str(writer.movie_file_path),
+                labels=LABELS.stats(),
+            )
+            return result
+
+        is_already_cached = writer.is_already_cached
+
+        def shared_is_already_cached(hash_invocation):
+            if is_already_cached(hash_invocation):
+                return True
+            if not self.in_shared_segment:
+                return False
+            return self.segments.fetch(
+                self.segment_key(hash_invocation),
+                os.path.join(
+                    writer.partial_movie_directory,
+                    f"{hash_invocation}{config.movie_file_extension}",
+                ),
+            )
+
+        writer.write_frame = counting_write_frame
+        writer.finish = reporting_finish
+        writer.is_already_cached = shared_is_already_cached
+        if PROFILER.enabled:
+            self.renderer.update_frame = PROFILER.timed(
+                "rasterize", self.renderer.update_frame
+            )
+            writer.write_frame = PROFILER.timed(
+                "write", writer.write_frame, frame=True
+            )
+            writer.end_animation = PROFILER.timed(
+                "write", writer.end_animation
+            )
+
+    def segment_key(self, hash_invocation):
+        """Everything about the output file that manim's hash leaves out."""
+        settings = f"{config.pixel_height}p{config.frame_rate:g}"
+        if config.transparent:
+            settings += "-transparent"
+        return f"{settings}/{hash_invocation}{config.movie_file_extension}"
+
+    @contextmanager
+    def shared_segment(self):
+        """Plays inside look the same for every array; render them once.
+
+        Their partial movies are kept in segments.py's store and copied
+        into later renders of this scene at this quality, where manim
+        then skips them like any cached play. Only wrap plays whose
+        mobjects don't depend on the input array.
+        """
+        self.in_shared_segment = True
+        try:
+            yield
+            # Deferred animations must not leak into the next play
+            self.flush_pending()
+        finally:
+            self.in_shared_segment = False
+
+    def play_cost(self, event):
+        costs = self.COMPACT_PLAY_COSTS if self.compact else self.PLAY_COSTS
+        return costs.get(event[0], 0)
+
+    def planned_plays(self, events):
+        """Rough number of plays ``events`` will take, for progress bars."""
+        return sum(self.play_cost(event) for event in events)
+
+    def summarize(self, events, length):
+        """Fold later passes together when the job asks for a short video."""
+        max_plays = self.job.get("max_animations")
+        if self.job.get("target_seconds"):
+            by_length = int(
+                self.job["target_seconds"] / self.global_animation_duration
+            )
+            max_plays = min(max_plays or by_length, by_length)
+        if not max_plays:
+            return events
+        budget = max_plays - self.renderer.num_plays - self.OUTRO_PLAYS
+        return summarize(events, max(budget, 1), self.play_cost, length)
+
+    def fade_out_trackers(self):
+        """Pointers and the comparison window mean nothing in a summary."""
+        animations = [FadeOut(pointer) for pointer in self.pointers.values()]
+        self.pointers = {}
+        if self.slider_window is not None:
+            animations.append(FadeOut(self.slider_window))
+            self.slider_window = None
+        return animations
+
+    def report_animation(self):
+        self.events.emit(
+            "animation",
+            index=self.renderer.num_plays,
+            frames=self.frames_written,
+        )
+        self.report_segment()
+
+    def report_segment(self):
+        """Announce the partial movie of the last play, once it's written.
+
+        Skipped plays (e.g. other chunks) leave no file behind.
+        """
+        partial_movies = self.renderer.file_writer.partial_movie_files
+        if len(partial_movies) <= self.segments_reported:
+            return
+        self.segments_reported = len(partial_movies)
+        if partial_movies[-1] is None:
+            return
+        self.events.emit(
+            "segment",
+            index=len(partial_movies) - 1,
+            path=os.path.relpath(str(partial_movies[-1]), REPO_DIR),
+            seconds=round(self.duration, 3),
+        )
+
+    def defer(self, *animations, run_time=None):
+        """Plays ``animations`` now, or with the next play in compact mode.
+
+        Anything deferred is built from the scene as it is right now, so
+        only defer animations that don't depend on an earlier deferred
+        animation of the same mobject having finished.
+        """
+        if not self.compact:
+            if run_time is None:
+                self.play(*animations)
+            else:
+                self.play(*animations, run_time=run_time)
+            return
+        self.pending_animations.append(
+            AnimationGroup(*animations, run_time=run_time)
+        )
+
+    def play(self, *animations, **kwargs):
+        if self.pending_animations:
+            current = AnimationGroup(
+                *animations, run_time=kwargs.pop("run_time", None)
+            )
+            animations = [Succession(*self.pending_animations, current)]
+            self.pending_animations = []
+        with PROFILER.play(animations):
+            super().play(*animations, **kwargs)
+        if self.in_shared_segment:
+            self.store_segment()
+        self.report_animation()
+
+    def store_segment(self):
+        hash_invocation = self.renderer.animations_hashes[-1]
+        partial_movie = self.renderer.file_writer.partial_movie_files[-1]
+        if hash_invocation is None or hash_invocation.startswith("uncached"):
+            return  # skipped, or manim's caching is disabled
+        self.segments.store(self.segment_key(hash_invocation), partial_movie)
+
+    def flush_pending(self):
+        """Play deferred animations on their own, see ``defer``."""
+        if self.pending_animations:
+            pending, self.pending_animations = self.pending_animations, []
+            self.play(Succession(*pending))
+
+    def wait(self, *args, **kwargs):
+        self.flush_pending()
+        super().wait(*args, **kwargs)
+        self.report_animation()
+
+    def play_trace(self, events, length):
+        """Animate ``events``, traced from an array of ``length`` cells."""
+        events = self.summarize(events, length)
+        self.events.emit(
+            "plan",
+            animations=self.renderer.num_plays
+            + self.planned_plays(events)
+            + self.OUTRO_PLAYS,
+        )
+        if self.chunk:
+            index, count = self.chunk["index"], self.chunk["count"]
+            bounds = chunk_bounds(events, count, self.play_cost)
+            start, stop = bounds[index], bounds[index + 1]
+        else:
+            start, stop = 0, len(events)
+        for position, (op, *args) in enumerate(events):
+            if self.chunk and position in (start, stop):
+                self.set_skipping(not start <= position < stop)
+            PROFILER.tag(event=position, op=op)
+            if op == "pass":
+                PROFILER.tag(**{"pass": args[0]})
+            getattr(self, f"on_{op}")(*args)
+        if self.chunk:
+            # The outro belongs to the last chunk
+            self.set_skipping(index != count - 1)
+
+    def set_skipping(self, skip):
+        """Only fast-forward through the plays that follow, or render them.
+
+        Skipped plays still run to their end state but write no frames,
+        which is how a chunk reconstructs the scene where it starts.
+        Deferred animations are flushed first so that none of them ends
+        up in the wrong chunk; played back to back that looks the same.
+        """
+        self.flush_pending()
+        self.renderer._original_skipping_status = skip
+
+    def on_pass(self, index):
+        pass
+
+    def on_line(self, line_no):
+        self.justHighlight(line_no)
+
+    def on_pointer(self, name, index):
+        """Creates the ``name`` pointer on first use, then moves it."""
+        position = self.num_tex[index].get_center()
+        label_text = f"{name}={index}"
+        # i points up from below the cell, j points down from above it
+        direction = DOWN if name == "i" else UP
+
+        if name not in self.pointers:
+            pointer = Triangle(fill_opacity=1, color=RED).scale(0.2)
+            if name != "i":
+                pointer.rotate(PI)
+            pointer.next_to(position, direction)
+            label = LABELS.get(Text, label_text, font_size=24).next_to(
+                pointer, direction * 0.2
+            )
+            self.pointers[name] = VGroup(pointer, label)
+            self.play(
+                Create(self.pointers[name]),
+                run_time=self.global_animation_duration,
+            )
+        else:
+            ptr_vg = self.pointers[name]
+            updated_label = LABELS.get(
+                Text, label_text, font_size=24
+            ).next_to(position, direction * 2.3)
+            self.play(
+                ptr_vg.animate.next_to(position, direction),
+                Transform(ptr_vg[1], updated_label),
+                run_time=self.global_animation_duration,
+            )
+
+    def create_pointer(self, position, label_text):
+        """Creates a pointer with a label below the given position."""
+        pointer = Triangle(fill_opacity=1, color=RED).scale(0.2)
+        pointer.next_to(position, DOWN)
+        label = LABELS.get(Text, label_text, font_size=24)
+        label.next_to(pointer, DOWN * 0.2)
+        return VGroup(pointer, label)
+
+    def display_code(self, code_text):
+        """Displays code snippet at the bottom."""
+        code = Code(
+            code=code_text,
+            tab_width=4,
+            background="window",
+            language="Python",
+            font_size=18,
+            insert_line_no=False,
+            line_spacing=0.6,
+        ).to_edge(DOWN)
+        self.play(Create(code))
+        return code
+
+    def build_code_block(self, code_str):
+        """Add the code panel and one highlight rectangle per line.
+
+        Highlighting and laying out the snippet is slow and gives the
+        same mobjects every time, so they are built once per process
+        and copied from the label cache after that.
+        """
+        key = ("Code", code_str, tuple(sorted(CODE_STYLE.items())))
+        m_code, self.sliding_wins = LABELS.build(
+            key, lambda: code_block(code_str)
+        )
+        self.add(m_code, self.sliding_wins)
+        return m_code
+
+    def highlight(self, prev_line, line):
+        self.play(
+            self.sliding_wins[prev_line].animate.set_opacity(0.3),
+            run_time=self.global_animation_duration,
+        )
+        self.play(
+            ReplacementTransform(
+                self.sliding_wins[prev_line], self.sliding_wins[line]
+            ),
+            run_time=self.global_animation_duration,
+        )
+        self.play(
+            self.sliding_wins[line].animate.set_opacity(0.3),
+            run_time=self.global_animation_duration,
+        )
+
+    currentlyHighlitedLine = -1  # that means no line is highlighted currently
+
+    def justHighlight(self, line_no):
+
+        if self.compact:
+            # Fade the old line out while the new one fades in
+            fades = [self.sliding_wins[line_no].animate.set_opacity(0.3)]
+            if not self.currentlyHighlitedLine == -1:
+                fades.append(
+                    self.sliding_wins[
+                        self.currentlyHighlitedLine
+                    ].animate.set_opacity(0.0)
+                )
+            self.defer(*fades, run_time=self.global_animation_duration)
+            self.currentlyHighlitedLine = line_no
+            return
+
+        if not self.currentlyHighlitedLine == -1:
+            self.play(
+                self.sliding_wins[
+                    self.currentlyHighlitedLine
+                ].animate.set_opacity(0.0),
+                run_time=self.global_animation_duration,
+            )
+
+        self.play(
+            self.sliding_wins[line_no].animate.set_opacity(0.3),
+            run_time=self.global_animation_duration,
+        )
+        self.currentlyHighlitedLine = line_no
+
+    def undoHighlight(self, line_no):
+        self.currentlyHighlitedLine = -1
+        self.defer(
+            self.sliding_wins[line_no].animate.set_opacity(0.0),
+            run_time=self.global_animation_duration,
+        )
+
+    def place_slider_window(self, Array: VGroup, at_index=0):
+        self.cover_group = VGroup(Array[at_index], Array[at_index + 1])
+        self.slider_window = SurroundingRectangle(
+            self.cover_group, color=RED, buff=0
+        )
+        self.slide_amount_1_unit = Array[0].width
+        self.slider_current_index = 0
+        self.play(
+            FadeIn(self.slider_window), run_time=self.global_animation_duration
+        )
+
+    def slide_window_to(self, target_index):
+        if self.slider_current_index < target_index:
+            dir = RIGHT
+        elif self.slider_current_index > target_index:
+            dir = LEFT
+        else:
+            return
+
+        net_slide_amount = self.slide_amount_1_unit * abs(
+            self.slider_current_index - target_index
+        )
+        self.play(
+            self.slider_window.animate.shift(dir * net_slide_amount),
+            run_time=self.global_animation_duration,
+        )
+        self.slider_current_index = target_index
+
+    def strobe_bg(self, mobj, color):
+        self.defer(mobj.animate.set_fill(color, opacity=0.3), run_time=0.4)
+        # Repeat the color so the fade out doesn't depend on the fade in
+        self.defer(mobj.animate.set_fill(color, opacity=0.0), run_time=0.4)
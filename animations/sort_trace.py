@@ -0,0 +1,211 @@
+"""Run the sorting algorithms up front and record what they do.
+
+Every tracer returns a flat list of events, each one a tuple whose first
+item is the operation and the rest are its arguments:
+
+    ("pass", i)                    start of outer loop iteration i
+    ("line", k)                    highlight line k of the code panel
+    ("pointer", name, index)       move loop pointer ``name`` to index
+    ("compare", a, b, result)      compare cells a and b, result is the
+                                   value of the ``if`` in the code
+    ("swap", a, b)                 swap cells a and b
+    ("select", index)              new minimum found (selection sort)
+    ("lift", index)                take the key out (insertion sort)
+    ("shift", src, dst)            copy cell src into dst (insertion sort)
+    ("insert", index)              drop the key into index (insertion sort)
+    ("sorted", index)              cell index reached its final place
+    ("rearrange", order, sorted)   summary of several passes: the value
+                                   now in cell k was in cell order[k],
+                                   ``sorted`` lists cells that became final
+
+Events only hold ints, strings, bools and lists of ints, so a trace can
+be stored as JSON and compared, cached or split without importing manim.
+The scenes turn traces into animations through SortScene.play_trace.
+"""
+
+
+def bubble_sort_trace(array):
+    a = list(array)
+    n = len(a)
+    events = []
+    for i in range(n - 1):
+        events += [("pass", i), ("line", 2), ("pointer", "i", i)]
+        for j in range(n - i - 1):
+            events += [("line", 3), ("pointer", "j", j), ("line", 4)]
+            swap = a[j] > a[j + 1]
+            events.append(("compare", j, j + 1, swap))
+            if swap:
+                a[j], a[j + 1] = a[j + 1], a[j]
+                events += [("line", 5), ("swap", j, j + 1)]
+        events.append(("sorted", n - i - 1))
+    events.append(("sorted", 0))
+    return events
+
+
+def selection_sort_trace(array):
+    a = list(array)
+    n = len(a)
+    events = []
+    for i in range(n - 1):
+        min_index = i
+        events += [("pass", i), ("line", 2), ("pointer", "i", i)]
+        for j in range(i + 1, n):
+            events += [("line", 3), ("pointer", "j", j)]
+            smaller = a[j] < a[min_index]
+            events.append(("compare", j, min_index, smaller))
+            if smaller:
+                min_index = j
+                events.append(("select", j))
+        if min_index != i:
+            a[i], a[min_index] = a[min_index], a[i]
+            events.append(("swap", i, min_index))
+        events.append(("sorted", i))
+    events.append(("sorted", n - 1))
+    return events
+
+
+def insertion_sort_trace(array):
+    a = list(array)
+    events = []
+    for step in range(1, len(a)):
+        key = a[step]
+        events += [("pass", step), ("lift", step)]
+        j = step - 1
+        while j >= 0:
+            smaller = key < a[j]
+            events.append(("compare", j, step, smaller))
+            if not smaller:
+                break
+            a[j + 1] = a[j]
+            events.append(("shift", j, j + 1))
+            j -= 1
+        a[j + 1] = key
+        events.append(("insert", j + 1))
+    return events
+
+
+TRACERS = {
+    "bubble": bubble_sort_trace,
+    "selection": selection_sort_trace,
+    "insertion": insertion_sort_trace,
+}
+
+
+def replay(array, events):
+    """Apply the data moves of ``events`` to a copy of ``array``."""
+    a = list(array)
+    key = None
+    for event in events:
+        op = event[0]
+        if op == "swap":
+            _, i, j = event
+            a[i], a[j] = a[j], a[i]
+        elif op == "lift":
+            key = a[event[1]]
+        elif op == "shift":
+            _, src, dst = event
+            a[dst] = a[src]
+        elif op == "insert":
+            a[event[1]] = key
+        elif op == "rearrange":
+            a = [a[k] for k in event[1]]
+    return a
+
+
+def apply_to_bars(bars, events):
+    """Apply ``events`` to a bar chart's NumPy state, for many at once.
+
+    ``bars`` has ``values``, ``highlighted`` and ``done`` arrays plus the
+    ``key`` of insertion sort; the cells the events touch end up
+    highlighted. Shared by the bar view and the raster engine.
+    """
+    values, lit = bars.values, bars.highlighted
+    lit[:] = False
+    for event in events:
+        op = event[0]
+        if op in ("compare", "swap"):
+            lit[event[1]] = lit[event[2]] = True
+            if op == "swap":
+                a, b = event[1], event[2]
+                values[a], values[b] = values[b], values[a]
+        elif op == "shift":
+            values[event[2]] = values[event[1]]
+            lit[event[2]] = True
+        elif op == "lift":
+            bars.key = values[event[1]]
+        elif op == "insert":
+            values[event[1]] = bars.key
+            lit[event[1]] = True
+        elif op == "sorted":
+            bars.done[event[1]] = True
+        elif op == "rearrange":
+            values[:] = values[event[1]]
+            bars.done[event[2]] = True
+
+
+def split_passes(events):
+    """Group a trace into lists that each start at a ``pass`` event."""
+    passes = []
+    for event in events:
+        if event[0] == "pass" or not passes:
+            passes.append([])
+        passes[-1].append(event)
+    return passes
+
+
+def summarize(events, max_plays, cost, length):
+    """Shorten a trace so that it takes at most ``max_plays`` plays.
+
+    ``cost(event)`` says how many plays an event takes in the scene and
+    ``length`` is the length of the traced array. The
+    first passes stay in full detail as long as they fit in half of the
+    budget; the remaining passes are folded into ``rearrange`` events,
+    several passes per event when needed, so any array size fits.
+    """
+    if sum(cost(event) for event in events) <= max_plays:
+        return events
+
+    passes = split_passes(events)
+    detail_budget = max_plays // 2
+    kept = []
+    for index, events_in_pass in enumerate(passes):
+        pass_cost = sum(cost(event) for event in events_in_pass)
+        if pass_cost > detail_budget:
+            break
+        kept += events_in_pass
+        detail_budget -= pass_cost
+        max_plays -= pass_cost
+    else:
+        return kept
+
+    rest = passes[index:]
+    per_summary = -(-len(rest) // max(max_plays, 1))  # ceiling division
+    for start in range(0, len(rest), per_summary):
+        span = [e for p in rest[start : start + per_summary] for e in p]
+        order = replay(range(length), span)
+        sorted_cells = [event[1] for event in span if event[0] == "sorted"]
+        kept.append(("rearrange", order, sorted_cells))
+    return kept
+
+
+def chunk_bounds(events, count, cost):
+    """Split a trace into ``count`` runs that take about as many plays.
+
+    Runs only start at a ``pass`` or ``rearrange`` event, so each one
+    begins at a clean outer loop iteration. Returns ``count + 1`` event
+    indices, run k being ``events[bounds[k]:bounds[k + 1]]``; runs at the
+    end are empty when there are fewer passes than runs.
+    """
+    total = sum(cost(event) for event in events)
+    bounds = [0]
+    spent = 0
+    for index, event in enumerate(events):
+        if (
+            index > 0
+            and len(bounds) < count
+            and event[0] in ("pass", "rearrange")
+            and spent >= total * len(bounds) / count
+        ):
+            bounds.append(index)
+        spent += cost(event)
+    return bounds + [len(events)] * (count + 1 - len(bounds))
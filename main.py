@@ -1,29 +1,228 @@
 import ast
-import subprocess
+import json
+import os
 import sys
 import time
 
-from PySide6.QtCore import QProcess, QUrl, Signal, Slot
+from PySide6.QtCore import QObject, QProcess, QTimer, QUrl, Signal, Slot
 from PySide6.QtGui import QIcon, Qt
-from PySide6.QtMultimedia import QMediaPlayer
-from PySide6.QtMultimediaWidgets import QVideoWidget
+from PySide6.QtNetwork import QLocalSocket
 from PySide6.QtWidgets import (
+    QAbstractItemView,
     QApplication,
+    QCheckBox,
     QComboBox,
     QFrame,
     QHBoxLayout,
+    QHeaderView,
     QLabel,
     QLineEdit,
     QProgressBar,
     QPushButton,
+    QSlider,
+    QSpinBox,
     QStackedWidget,
+    QTableWidget,
+    QTableWidgetItem,
     QTextEdit,
     QVBoxLayout,
     QWidget,
 )
 
+from sortflow.algorithms import (
+    ALGORITHMS,
+    MANIM_QUALITY_FLAGS,
+    PREVIEW_QUALITY,
+    QUALITY,
+    REPO_DIR,
+    algorithm_for_job,
+)
+from sortflow.cache import RenderCache
+from sortflow.docker import JOB_ENV, MOUNT_DIR, docker_command
+from sortflow.jobs import (
+    CANCELLED,
+    DONE,
+    FAILED,
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_PREVIEW,
+    QUEUED,
+    RUNNING,
+    JobQueue,
+    RenderJob,
+    container_name,
+    media_dir,
+    new_job_dir,
+    remove_job_dir,
+)
+from sortflow.progress import (
+    EventFileReader,
+    ProgressTracker,
+    new_progress_path,
+    progress_kind,
+)
+from sortflow.transcode import (
+    DISTRIBUTION_DIR,
+    TRANSCODE_ENV,
+    TranscodePool,
+    TranscodeSettings,
+    describe_savings,
+)
+from sortflow.video import is_complete_mp4
+from sortflow.worker import SOCKET_PATH
+
 # import time
 
+# The style of every page, set once on the QApplication so Qt parses it
+# once instead of per page. Rules are scoped by the page's class name.
+STYLE_SHEET = """
+MainPage QLabel {
+    font-size: 80px;
+    font-weight: bold;
+    margin-bottom: 30px;
+}
+MainPage QPushButton {
+    font-size: 16px;
+    padding: 15px 60px;
+    background-color: #4CAF50;
+    color: white;
+    border-radius: 10px;
+    border: none;
+    outline: none;
+}
+MainPage QPushButton:hover {
+    background-color: #45a049;
+}
+MainPage QPushButton:pressed {
+    background-color: #387c3a;
+}
+AlgorithmPage QLabel {
+    font-size: 40px;
+    font-weight: bold;
+    color: #ffffff;
+}
+AlgorithmPage QPushButton {
+    font-size: 16px;
+    padding: 10px 20px;
+    background-color: #4CAF50;
+    color: white;
+    border-radius: 10px;
+    border: none;
+    outline: none;
+}
+AlgorithmPage QPushButton:hover {
+    background-color: #45a049;
+}
+AlgorithmPage QPushButton:pressed {
+    background-color: #387c3a;
+}
+AlgorithmPage QComboBox {
+    font-size: 14px;
+    padding: 5px 90px;
+    border: 1px solid #ccc;
+    border-radius: 5px;
+}
+AlgorithmPage QComboBox:hover {
+    border-color: #4CAF50;
+}
+AlgorithmPage QComboBox:focus {
+    border-color: #4CAF50;
+}
+AlgorithmPage QComboBox QAbstractItemView {
+    border: 1px solid #ccc;
+    selection-background-color: #4CAF50;
+    selection-color: white;
+}
+InputPage QLabel {
+    font-size: 25px;
+    color: #ffffff;
+    margin-right: 20px;
+}
+InputPage QPushButton {
+    font-size: 16px;
+    padding: 10px 20px;
+    background-color: #4CAF50;
+    color: white;
+    border-radius: 10px;
+    border: none;
+    outline: none;
+}
+InputPage QPushButton:hover {
+    background-color: #45a049;
+}
+InputPage QPushButton:pressed {
+    background-color: #387c3a;
+}
+InputPage QLineEdit {
+    font-size: 14px;
+    padding: 8px 200px;
+    border: 1px solid #ccc;
+    border-radius: 5px;
+}
+InputPage QLineEdit:focus {
+    border-color: #4CAF50;
+}
+ManimStdoutCapturePage QLabel {
+    font-size: 40px;
+    font-weight: bold;
+    margin-bottom: 20px;
+}
+ManimStdoutCapturePage QProgressBar {
+    height: 30px;
+    width: 500px;
+    border-radius: 10px;
+    margin-top: 0px;
+    margin-bottom: 10px;
+}
+ManimStdoutCapturePage QProgressBar::chunk {
+    background-color: #4CAF50;
+    border-radius: 10px;
+}
+ManimStdoutCapturePage QTextEdit {
+    font-size: 14px;
+    padding: 10px;
+    border: 2px solid #ccc;
+    border-radius: 10px;
+}
+ManimStdoutCapturePage QPushButton {
+    font-size: 16px;
+    padding: 10px 20px;
+    background-color: #4CAF50;
+    color: white;
+    border-radius: 10px;
+    border: none;
+    outline: none;
+}
+ManimStdoutCapturePage QPushButton:hover {
+    background-color: #45a049;
+}
+ManimStdoutCapturePage QPushButton:disabled {
+    background-color: #8a8a8a;
+}
+ManimStdoutCapturePage QLabel#eta {
+    font-size: 18px;
+    font-weight: normal;
+}
+FinalPage QPushButton {
+    font-size: 16px;
+    padding: 8px 16px;
+    background-color: #4CAF50;
+    color: white;
+    border-radius: 10px;
+    border: none;
+    outline: none;
+}
+FinalPage QPushButton:hover {
+    background-color: #45a049;
+}
+FinalPage QPushButton:disabled {
+    background-color: #8a8a8a;
+}
+FinalPage QLabel {
+    font-size: 16px;
+}
+"""
+
 
 class MainPage(QWidget):
     start_clicked = Signal()  # Signal to switch to algorithm selection
@@ -34,30 +233,8 @@ class MainPage(QWidget):
         self.setWindowIcon(QIcon("icon.png"))
 
         title_label = QLabel("SortFlow")
-        title_label.setStyleSheet(
-            "font-size: 80px; font-weight: bold; text-align: center; margin-bottom: 30px"
-        )
 
         start_button = QPushButton("Start")
-        start_button.setStyleSheet(
-            """
-            QPushButton {
-                font-size: 16px;
-                padding: 15px 60px;
-                background-color: #4CAF50;
-                color: white;
-                border-radius: 10px;
-                border: none;
-                outline: none;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-            QPushButton:pressed {
-                background-color: #387c3a;
-            }
-        """
-        )
         start_button.clicked.connect(
             self.start_clicked.emit
         )  # Emit the signal when clicked
@@ -95,47 +272,6 @@ class AlgorithmPage(QWidget):
         select_button = QPushButton("Select Algorithm")
         select_button.clicked.connect(self.select_algorithm)
 
-        style = """
-            QLabel {
-                font-size: 40px;
-                font-weight: bold;
-                color: #ffffff;
-            }
-            QPushButton {
-                font-size: 16px;
-                padding: 10px 20px;
-                background-color: #4CAF50;
-                color: white;
-                border-radius: 10px;
-                border: none;
-                outline: none;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-            QPushButton:pressed {
-                background-color: #387c3a;
-            }
-            QComboBox {
-                font-size: 14px;
-                padding: 5px 90px;
-                border: 1px solid #ccc;
-                border-radius: 5px;
-            }
-            QComboBox:hover {
-                border-color: #4CAF50;
-            }
-            QComboBox:focus {
-                border-color: #4CAF50;
-            }
-            QComboBox QAbstractItemView {
-                border: 1px solid #ccc;
-                selection-background-color: #4CAF50;
-                selection-color: white;
-            }
-        """
-        self.setStyleSheet(style)
-
         v_layout = QVBoxLayout()
 
         v_layout.addWidget(request_test)
@@ -163,7 +299,9 @@ class AlgorithmPage(QWidget):
 
 
 class InputPage(QWidget):
-    input_done = Signal()
+    input_done = Signal(str, list, dict)  # algorithm, array, job options
+    queue_requested = Signal(str, list, dict)  # same, rendered later
+    show_queue_requested = Signal()
 
     def __init__(self):
         super().__init__()
@@ -175,40 +313,40 @@ class InputPage(QWidget):
             "Enter a list of numbers (comma separated)"
         )
 
+        self.compact_checkbox = QCheckBox(
+            "Compact mode (merge small animations, renders faster)"
+        )
+
+        # Long inputs get their later passes summarized to fit this length
+        self.target_length_label = QLabel("Target video length:")
+        self.target_length = QSpinBox()
+        self.target_length.setRange(0, 3600)
+        self.target_length.setSuffix(" s")
+        self.target_length.setSpecialValueText("full length")
+
+        # Preset by the algorithm page, changeable for every queued job
+        self.algorithm_label = QLabel("Algorithm:")
+        self.algorithm_list = QComboBox()
+        self.algorithm_list.addItems(list(ALGORITHMS))
+
+        self.view_label = QLabel("View:")
+        self.view_list = QComboBox()
+        self.view_list.addItem("Cells (detailed)", "cells")
+        self.view_list.addItem("Bars (large arrays)", "bars")
+
+        self.engine_label = QLabel("Renderer:")
+        self.engine_list = QComboBox()
+        self.engine_list.addItem("manim (pretty)", "manim")
+        self.engine_list.addItem("raster (fast)", "raster")
+
         go_button = QPushButton("Generate Animation")
-        go_button.clicked.connect(self.write_array_to_module)
-        style = """
-            QLabel {
-                font-size: 25px;
-                color: #ffffff;
-                margin-right: 20px;
-            }
-            QPushButton {
-                font-size: 16px;
-                padding: 10px 20px;
-                background-color: #4CAF50;
-                color: white;
-                border-radius: 10px;
-                border: none;
-                outline: none;
-            }
-            QPushButton:hover {
-                background-color: #45a049;
-            }
-            QPushButton:pressed {
-                background-color: #387c3a;
-            }
-            QLineEdit {
-                font-size: 14px;
-                padding: 8px 200px;
-                border: 1px solid #ccc;
-                border-radius: 5px;
-            }
-            QLineEdit:focus {
-                border-color: #4CAF50;
-            }
-        """
-        self.setStyleSheet(style)
+        go_button.clicked.connect(self.submit_array)
+
+        # Renders in the background at batch priority, nothing plays
+        queue_button = QPushButton("Add to Queue")
+        queue_button.clicked.connect(self.queue_array)
+        show_queue_button = QPushButton("Show Queue")
+        show_queue_button.clicked.connect(self.show_queue_requested.emit)
 
         h_layout = QHBoxLayout()
         v_layout = QVBoxLayout()
@@ -222,8 +360,33 @@ class InputPage(QWidget):
         v_layout.addLayout(h_layout)
         v_layout.setAlignment(h_layout, Qt.AlignmentFlag.AlignCenter)
 
-        v_layout.addWidget(go_button)
-        v_layout.setAlignment(go_button, Qt.AlignmentFlag.AlignCenter)
+        v_layout.addWidget(self.compact_checkbox)
+        v_layout.setAlignment(
+            self.compact_checkbox, Qt.AlignmentFlag.AlignCenter
+        )
+
+        length_layout = QHBoxLayout()
+        length_layout.addWidget(self.target_length_label)
+        length_layout.addWidget(self.target_length)
+        v_layout.addLayout(length_layout)
+        v_layout.setAlignment(length_layout, Qt.AlignmentFlag.AlignCenter)
+
+        view_layout = QHBoxLayout()
+        view_layout.addWidget(self.algorithm_label)
+        view_layout.addWidget(self.algorithm_list)
+        view_layout.addWidget(self.view_label)
+        view_layout.addWidget(self.view_list)
+        view_layout.addWidget(self.engine_label)
+        view_layout.addWidget(self.engine_list)
+        v_layout.addLayout(view_layout)
+        v_layout.setAlignment(view_layout, Qt.AlignmentFlag.AlignCenter)
+
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(go_button)
+        buttons_layout.addWidget(queue_button)
+        buttons_layout.addWidget(show_queue_button)
+        v_layout.addLayout(buttons_layout)
+        v_layout.setAlignment(buttons_layout, Qt.AlignmentFlag.AlignCenter)
 
         self.status_label = QLabel("")
         v_layout.addWidget(self.status_label)
@@ -240,7 +403,24 @@ class InputPage(QWidget):
         output_str = "[" + input_str + "]"
         return output_str
 
-    def write_array_to_module(self):
+    def set_algorithm(self, algorithm):
+        self.algorithm_list.setCurrentText(algorithm)
+
+    def job_options(self):
+        """The job spec handed to the scenes, see animations/job_spec.py."""
+        options = {}
+        if self.compact_checkbox.isChecked():
+            options["compact"] = True
+        if self.target_length.value():
+            options["target_seconds"] = self.target_length.value()
+        if self.view_list.currentData() != "cells":
+            options["view"] = self.view_list.currentData()
+        if self.engine_list.currentData() != "manim":
+            options["engine"] = self.engine_list.currentData()
+        return options
+
+    def parse_array(self):
+        """The array typed in, or None after showing what's wrong."""
         # Retrieve the user input from the text box
         user_input = self.number_input.text().strip()
         wrapped_list = self.wrap_string_with_square_bracket(user_input)
@@ -251,60 +431,595 @@ class InputPage(QWidget):
 
             if not isinstance(array, list):
                 raise ValueError("Input is not a valid list.")
+        except Exception as e:
+            # In case of error, show error message
+            self.status_label.setText(f"Error: {str(e)}")
+            self.status_label.setStyleSheet("color: red;")
+            return None
+        return array
+
+    def submit_array(self):
+        array = self.parse_array()
+        if array is None:
+            return
+
+        # Update status
+        self.status_label.setText("Generating animation...")
+        self.status_label.setStyleSheet("color: green;")
+
+        # ! Trigger ManimStdoutCapturePage page from here
+        # The array travels with the job spec, see job_spec.py
+        self.input_done.emit(
+            self.algorithm_list.currentText(), array, self.job_options()
+        )
+
+    def queue_array(self):
+        array = self.parse_array()
+        if array is None:
+            return
+        algorithm = self.algorithm_list.currentText()
+        self.status_label.setText(f"Queued {algorithm} {array}.")
+        self.status_label.setStyleSheet("color: green;")
+        self.queue_requested.emit(algorithm, array, self.job_options())
+
+
+class RenderRunner(QObject):
+    """Runs one RenderJob, on the warm worker or in a fresh container.
+
+    Everything the render page used to do for its single job: pick a
+    private output folder, follow the progress events, wait for a
+    complete video and put it in the render cache.
+    """
+
+    log = Signal(str)
+    progress_changed = Signal()
+    segment_ready = Signal(str, float)  # finished part of the video, seconds
+    finished = Signal(object)  # the RenderJob, with status and video set
+
+    def __init__(self, job, render_cache, use_worker, parent=None):
+        super().__init__(parent)
+        self.job = job
+        self.render_cache = render_cache
+        self.use_worker = use_worker
+        self.cancelling = False
+
+        self.process = QProcess(self)
+        self.process.readyReadStandardOutput.connect(self.handle_stdout_output)
+        self.process.readyReadStandardError.connect(self.handle_stderr_output)
+        self.process.finished.connect(self.on_process_finish)
+
+        # Connection to the warm render worker (see sortflow/worker.py)
+        self.worker_socket = QLocalSocket(self)
+        self.worker_socket.connected.connect(self.on_worker_connected)
+        self.worker_socket.readyRead.connect(self.handle_worker_output)
+        self.worker_socket.errorOccurred.connect(self.on_worker_error)
+        self.worker_started = False
+        self.worker_answered = False  # got done, error or cancelled
+        self.worker_buffer = b""
+
+        # The scene appends progress events to a file, poll it
+        self.progress_timer = QTimer(self)
+        self.progress_timer.setInterval(250)
+        self.progress_timer.timeout.connect(self.poll_progress)
+
+        # Polls for the finished video instead of sleeping on the GUI thread
+        self.video_timer = QTimer(self)
+        self.video_timer.setInterval(100)
+        self.video_timer.timeout.connect(self.check_video)
+        self.pending_video = None
+        self.video_deadline = 0
+
+    def start(self):
+        job = self.job
+        options = job.options
+        self.cache_key = self.render_cache.key(
+            job.algorithm, job.array, job.quality, **options
+        )
+        if job.quality == PREVIEW_QUALITY:
+            self.log.emit("Rendering a quick preview...")
+        else:
+            self.log.emit(f"Rendering in {job.quality}...")
+
+        progress_path = new_progress_path(job.algorithm.slug)
+        self.options = dict(options, array=job.array, progress=progress_path)
+        # Every render gets its own output folder, see sortflow/jobs.py
+        self.job_dir = job.job_dir = new_job_dir(job.algorithm.slug)
+        self.progress_reader = EventFileReader(progress_path)
+        self.progress = ProgressTracker(
+            progress_kind(job.algorithm, job.quality, options)
+        )
+        self.job.progress_text = "Starting renderer..."
+        self.progress_changed.emit()
+        self.progress_timer.start()
+
+        # Prefer the warm worker, run_cold_process is the fallback
+        if self.use_worker:
+            self.worker_socket.connectToServer(SOCKET_PATH)
+        else:
+            self.run_cold_process()
 
-            # Write the array to the module
-            file_path = "./animations/user_array.py"
-            with open(file_path, "w") as f:
-                # Write the array to the Python file as a list
-                f.write(f"my_array = {array}\n")
-            print(f"Array written to {file_path}")
+    def cancel(self):
+        """Stop the render, then clean up once it really stopped.
 
-            # Update status
-            self.status_label.setText(
-                "Array successfully saved. Generating animation..."
+        Killing ``docker run`` would leave its container rendering, so
+        the container is killed by name and the job ends when ``docker
+        run`` returns. The worker is told over its socket and answers
+        once it stopped. Either way the job ends after 10 s at most.
+        """
+        if self.job.finished or self.cancelling:
+            return
+        self.cancelling = True
+        self.log.emit("Cancelling...")
+        self.video_timer.stop()
+        if self.process.state() != QProcess.ProcessState.NotRunning:
+            QProcess.startDetached(
+                "docker", ["kill", container_name(self.job)]
+            )
+        elif (
+            self.worker_socket.state()
+            == QLocalSocket.LocalSocketState.ConnectedState
+        ):
+            self.worker_socket.write(b'{"event": "cancel"}\n')
+        else:
+            self.end(CANCELLED)
+            return
+        QTimer.singleShot(10000, self.force_cancel)
+
+    def force_cancel(self):
+        if self.job.finished:
+            return
+        self.worker_socket.abort()
+        self.process.kill()
+        self.end(CANCELLED)
+
+    def run_cold_process(self):
+        env = {JOB_ENV: json.dumps(self.options)}
+        container_media_dir = f"{MOUNT_DIR}/{self.job_dir}/media"
+        if self.job.algorithm.engine == "raster":
+            command = docker_command(
+                "python",
+                "-m",
+                "sortflow.raster",
+                "--algo",
+                self.job.algorithm.slug,
+                "--quality",
+                self.job.quality,
+                "--media-dir",
+                container_media_dir,
+                name=container_name(self.job),
+                env=env,
+            )
+        else:
+            command = docker_command(
+                "/bin/bash",
+                "-c",
+                f"cd {MOUNT_DIR}/animations/ && manim "
+                f"-q{MANIM_QUALITY_FLAGS[self.job.quality]} "
+                f"--media_dir {container_media_dir} "
+                # Modules like bars.py hold several scenes; without a
+                # name manim asks which one on stdin and gives up
+                f"{self.job.algorithm.module} {self.job.algorithm.scene}",
+                name=container_name(self.job),
+                env=env,
+            )
+        self.process.start(command[0], command[1:])
+
+    def on_worker_connected(self):
+        job = {
+            "algorithm": self.job.algorithm.name,
+            "quality": self.job.quality,
+            "options": self.options,
+            "media_dir": os.path.join(self.job_dir, "media"),
+        }
+        self.worker_socket.write((json.dumps(job) + "\n").encode("utf-8"))
+
+    def on_worker_error(self, error):
+        if self.job.finished:
+            return
+        # The answer may still be waiting in the socket's read buffer
+        self.handle_worker_output()
+        if self.job.finished:
+            return
+        if self.cancelling:
+            self.end(CANCELLED)  # the worker hung up, it stopped as well
+        elif self.worker_answered:
+            pass  # it hangs up after every job, the video is on its way
+        elif not self.worker_started:
+            self.log.emit(
+                "Render worker not available, starting a new container..."
+            )
+            self.run_cold_process()
+        else:
+            # The worker died or its container was killed mid-render
+            self.log.emit(f"Lost connection to render worker: {error}")
+            self.render_failed()
+
+    def handle_worker_output(self):
+        self.worker_buffer += bytes(self.worker_socket.readAll())
+        *lines, self.worker_buffer = self.worker_buffer.split(b"\n")
+        for line in lines:
+            message = json.loads(line)
+            if message["event"] in ("done", "error", "cancelled"):
+                self.worker_answered = True
+            if message["event"] == "started":
+                self.worker_started = True
+            elif message["event"] == "log":
+                self.log.emit(message["text"])
+            elif message["event"] == "cancelled":
+                self.end(CANCELLED)
+            elif self.cancelling:
+                continue  # finished before it saw the cancel, drop it
+            elif message["event"] == "done":
+                self.log.emit("Render worker finished the job.")
+                self.wait_for_video(os.path.join(REPO_DIR, message["path"]))
+            elif message["event"] == "error":
+                self.worker_started = True  # don't retry a failing job
+                self.log.emit(message["message"])
+                self.render_failed()
+
+    def poll_progress(self):
+        for event in self.progress_reader.read_new():
+            self.progress.feed(event)
+            if event["event"] == "segment" and not self.cancelling:
+                self.segment_ready.emit(
+                    os.path.join(REPO_DIR, event["path"]), event["seconds"]
+                )
+
+        self.job.fraction = self.progress.fraction()
+        if self.job.fraction is None:
+            return
+        if self.progress.phase == "encoding":
+            self.job.progress_text = "Encoding video..."
+        else:
+            text = f"Animation {self.progress.done} of ~{self.progress.total}"
+            eta = self.progress.eta()
+            if eta is not None:
+                minutes, seconds = divmod(int(eta), 60)
+                text += f"  |  about {minutes}:{seconds:02d} left"
+            self.job.progress_text = text
+        self.progress_changed.emit()
+
+    def stop_progress(self, succeeded):
+        self.progress_timer.stop()
+        self.poll_progress()
+        if succeeded:
+            self.progress.finish()
+            self.job.fraction = 1.0
+            self.job.progress_text = "Done."
+        elif self.job.status == CANCELLED:
+            self.job.progress_text = "Cancelled."
+        else:
+            self.job.progress_text = "Render failed."
+        self.progress_reader.remove()
+        self.progress_changed.emit()
+
+    def handle_stdout_output(self):
+        stdout_output = bytes(self.process.readAllStandardOutput()).decode(
+            "utf-8"
+        )
+        self.log.emit(stdout_output)
+
+    def handle_stderr_output(self):
+        stderr_output = bytes(self.process.readAllStandardError()).decode(
+            "utf-8"
+        )
+        self.log.emit(stderr_output)
+
+    def on_process_finish(self, exit_code, exit_status):
+        if self.job.finished:
+            return
+        if self.cancelling:
+            self.end(CANCELLED)
+        elif exit_status == QProcess.ExitStatus.NormalExit and exit_code == 0:
+            self.log.emit(
+                f"Process finished successfully with exit code: {exit_code}."
+            )
+            self.wait_for_video(
+                self.job.algorithm.output_path(
+                    self.job.quality, media_dir(self.job_dir)
+                )
+            )
+        else:
+            self.log.emit(f"Process crashed with exit code: {exit_code}.")
+            self.render_failed()
+
+    def wait_for_video(self, video_path):
+        """Hand the video on as soon as it's completely written."""
+        self.pending_video = video_path
+        self.video_deadline = time.monotonic() + 30
+        self.video_timer.start()
+        self.check_video()
+
+    def check_video(self):
+        if is_complete_mp4(self.pending_video):
+            self.video_timer.stop()
+            self.finish_render(self.pending_video)
+        elif time.monotonic() > self.video_deadline:
+            self.video_timer.stop()
+            self.log.emit(
+                f"No valid video was written to {self.pending_video}."
+            )
+            self.render_failed()
+
+    def render_failed(self):
+        self.end(FAILED)
+
+    def finish_render(self, video_path):
+        self.job.video = self.render_cache.put(self.cache_key, video_path)
+        self.end(DONE)
+
+    def end(self, status):
+        self.job.status = status
+        self.stop_progress(succeeded=status == DONE)
+        if not self.job.held:
+            # The cache has its own copy now; a streamed job's folder goes
+            # once the player is done with it, see RenderScheduler.release
+            remove_job_dir(self.job_dir)
+            self.job.job_dir = None
+        # Let the worker connection that delivered this wind down first
+        QTimer.singleShot(0, self.wind_down)
+
+    def wind_down(self):
+        # Also stops a connection to the worker that is still being made
+        self.worker_socket.abort()
+        self.finished.emit(self.job)
+
+
+class RenderScheduler(QObject):
+    """Starts queued jobs while fewer than ``max_running`` are running.
+
+    Only one job at a time can use the warm worker (it renders one job
+    after the other anyway); the others get their own container.
+    """
+
+    job_changed = Signal(object)  # any RenderJob whose state changed
+    job_finished = Signal(object)
+    log = Signal(object, str)  # RenderJob, text
+    segment_ready = Signal(object, str, float)  # RenderJob, path, seconds
+    # Sent from a transcode thread: RenderJob, Future of the record
+    transcoded = Signal(object, object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.queue = JobQueue()
+        self.render_cache = RenderCache()
+        self.runners = {}  # job id -> RenderRunner
+        self.worker_job = None
+        # Compact copies of the full quality renders, see transcode.py
+        try:
+            self.transcode_settings = TranscodeSettings.from_env()
+        except ValueError as e:
+            # An optional extra; a typo must not keep the app from starting
+            print(
+                f"Ignoring {TRANSCODE_ENV}, compact copies are off: {e}",
+                file=sys.stderr,
             )
-            self.status_label.setStyleSheet("color: green;")
+            self.transcode_settings = None
+        self.transcoder = TranscodePool()
+        self.transcoded.connect(self.on_transcoded)
 
-            # ! Trigger ManimStdoutCapturePage page from here
-            self.input_done.emit()
+    def cached_video(self, algorithm, array, options, quality):
+        return self.render_cache.get(
+            self.render_cache.key(algorithm, array, quality, **options)
+        )
+
+    def submit(self, algorithm, array, options, quality, priority):
+        """Queue a render, or finish it right away from the cache."""
+        job = self.queue.submit(
+            RenderJob(algorithm, array, options, quality, priority)
+        )
+        cache_key = self.render_cache.key(algorithm, array, quality, **options)
+        cached_video = self.render_cache.get(cache_key)
+        if cached_video is not None:
+            job.video = cached_video
+            job.fraction = 1.0
+            self.queue.mark(job, DONE)
+            self.log.emit(job, f"Found cached animation: {cached_video}")
+            self.job_changed.emit(job)
+            QTimer.singleShot(0, lambda: self.job_finished.emit(job))
+            self.distribute(job, cache_key)
+            return job
+        self.job_changed.emit(job)
+        self.schedule()
+        return job
+
+    def schedule(self):
+        while (job := self.queue.next_to_start()) is not None:
+            use_worker = self.worker_job is None
+            if use_worker:
+                self.worker_job = job
+            runner = RenderRunner(job, self.render_cache, use_worker, self)
+            runner.log.connect(lambda text, job=job: self.log.emit(job, text))
+            runner.progress_changed.connect(
+                lambda job=job: self.job_changed.emit(job)
+            )
+            runner.segment_ready.connect(
+                lambda path, seconds, job=job: self.segment_ready.emit(
+                    job, path, seconds
+                )
+            )
+            runner.finished.connect(self.on_runner_finished)
+            self.runners[job.id] = runner
+            self.queue.mark(job, RUNNING)
+            self.job_changed.emit(job)
+            runner.start()
+
+    def cancel(self, job):
+        if job.status == QUEUED:
+            self.queue.mark(job, CANCELLED)
+            self.job_changed.emit(job)
+            self.job_finished.emit(job)
+        elif job.status == RUNNING:
+            self.runners[job.id].cancel()
+
+    def cancel_all(self):
+        for job in list(self.queue.jobs):
+            if not job.finished:
+                self.cancel(job)
+
+    def move(self, job, steps):
+        self.queue.move(job, steps)
+        self.job_changed.emit(job)
+
+    def hold(self, job):
+        """Keep the job's folder after it ends, its segments are playing."""
+        job.held = True
+
+    def release(self, job):
+        """The player let go of the job's segments, remove them once done."""
+        job.held = False
+        if job.finished and job.job_dir is not None:
+            remove_job_dir(job.job_dir)
+            job.job_dir = None
+
+    def on_runner_finished(self, job):
+        runner = self.runners.pop(job.id)
+        runner.deleteLater()
+        if self.worker_job is job:
+            self.worker_job = None
+        self.job_changed.emit(job)
+        self.job_finished.emit(job)
+        if job.status == DONE:
+            self.distribute(job, runner.cache_key)
+        self.schedule()
+
+    def distribute(self, job, cache_key):
+        """Make the compact copy of a full quality render in the background."""
+        if self.transcode_settings is None or job.quality != QUALITY:
+            return
+        settings = self.transcode_settings
+        output = os.path.join(
+            DISTRIBUTION_DIR,
+            f"{job.algorithm.slug}-{cache_key[:12]}-{settings.tag()}.mp4",
+        )
+        if os.path.exists(output):
+            job.distribution = output
+            return
+        future = self.transcoder.submit(
+            job.video, output, settings, algorithm=job.algorithm.name
+        )
+        future.add_done_callback(
+            lambda future, job=job: self.transcoded.emit(job, future)
+        )
 
+    def on_transcoded(self, job, future):
+        try:
+            record = future.result()
         except Exception as e:
-            # In case of error, show error message
-            self.status_label.setText(f"Error: {str(e)}")
-            self.status_label.setStyleSheet("color: red;")
+            self.log.emit(job, f"Making the compact copy failed: {e!r}")
+            return
+        job.distribution = record["output"]
+        self.log.emit(
+            job,
+            f"Compact copy {record['output']}: {describe_savings(record)}",
+        )
 
 
-class ManimStdoutCapturePage(QWidget):
-    manim_process_success = Signal()
+class JobQueuePanel(QWidget):
+    """Table of all render jobs with cancel and reorder buttons."""
 
-    def __init__(self):
+    play_requested = Signal(str)
+
+    COLUMNS = ("Job", "Status", "Progress")
+
+    def __init__(self, scheduler):
         super().__init__()
+        self.scheduler = scheduler
+        self.rows = {}  # job id -> table row
 
-        style = """
-            QLabel {
-                font-size: 40px;
-                font-weight: bold;
-                margin-bottom: 20px;
-            }
-            QProgressBar {
-                height: 30px;
-                width: 500px;
-                border-radius: 10px;
-                margin-top: 0px;
-                margin-bottom: 10px;
-            }
-            QProgressBar::chunk {
-                background-color: #4CAF50;
-                border-radius: 10px;
-            }
-            QTextEdit {
-                font-size: 14px;
-                padding: 10px;
-                border: 2px solid #ccc;
-                border-radius: 10px;
-            }
-        """
-        self.setStyleSheet(style)
+        self.table = QTableWidget(0, len(self.COLUMNS))
+        self.table.setHorizontalHeaderLabels(self.COLUMNS)
+        self.table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Stretch
+        )
+        self.table.setSelectionBehavior(
+            QAbstractItemView.SelectionBehavior.SelectRows
+        )
+        self.table.setSelectionMode(
+            QAbstractItemView.SelectionMode.SingleSelection
+        )
+        self.table.setEditTriggers(
+            QAbstractItemView.EditTrigger.NoEditTriggers
+        )
+        self.table.cellDoubleClicked.connect(self.play_row)
+
+        up_button = QPushButton("Move Up")
+        up_button.clicked.connect(lambda: self.move_selected(-1))
+        down_button = QPushButton("Move Down")
+        down_button.clicked.connect(lambda: self.move_selected(1))
+        cancel_button = QPushButton("Cancel")
+        cancel_button.clicked.connect(self.cancel_selected)
+
+        buttons = QHBoxLayout()
+        buttons.addWidget(up_button)
+        buttons.addWidget(down_button)
+        buttons.addWidget(cancel_button)
+
+        layout = QVBoxLayout()
+        layout.addWidget(self.table)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        # Starting or moving one job changes the place in line of others
+        scheduler.job_changed.connect(self.refresh)
+        # The panel is built lazily, jobs may be queued already
+        self.refresh()
+
+    def refresh(self, changed_job=None):
+        pending = self.scheduler.queue.pending()
+        for job in self.scheduler.queue.jobs:
+            if job.id not in self.rows:
+                row = self.rows[job.id] = self.table.rowCount()
+                self.table.insertRow(row)
+                for column in range(len(self.COLUMNS)):
+                    item = QTableWidgetItem()
+                    item.setData(Qt.ItemDataRole.UserRole, job.id)
+                    self.table.setItem(row, column, item)
+            status = job.status
+            if job in pending:
+                status += f" (#{pending.index(job) + 1} in line)"
+            progress = "" if job.fraction is None else f"{job.fraction:.0%}"
+            for column, text in enumerate((job.describe(), status, progress)):
+                # Update in place so the selection stays put
+                self.table.item(self.rows[job.id], column).setText(text)
+
+    def selected_job(self):
+        rows = self.table.selectionModel().selectedRows()
+        if not rows:
+            return None
+        job_id = self.table.item(rows[0].row(), 0).data(
+            Qt.ItemDataRole.UserRole
+        )
+        return next(j for j in self.scheduler.queue.jobs if j.id == job_id)
+
+    def move_selected(self, steps):
+        job = self.selected_job()
+        if job is not None:
+            self.scheduler.move(job, steps)
+
+    def cancel_selected(self):
+        job = self.selected_job()
+        if job is not None:
+            self.scheduler.cancel(job)
+
+    def play_row(self, row, column):
+        self.table.selectRow(row)
+        job = self.selected_job()
+        if job is not None and job.video is not None:
+            self.play_requested.emit(job.video)
+
+
+class ManimStdoutCapturePage(QWidget):
+    manim_process_success = Signal(str)  # path of the video to play
+    preview_ready = Signal(str)  # low quality version of the same video
+    # The final render's segments while it's running, see SortScene
+    stream_started = Signal(str, float)  # path, seconds
+    segment_ready = Signal(str, float)
+    new_job_requested = Signal()
+
+    def __init__(self, scheduler):
+        super().__init__()
+        self.scheduler = scheduler
 
         request_text_label = QLabel("Generating Animation. Please Wait...")
 
@@ -312,6 +1027,9 @@ class ManimStdoutCapturePage(QWidget):
         self.progress_bar.setRange(0, 0)  # Make it infinite (endless)
         self.progress_bar.setTextVisible(False)  # Hide text in progress bar
 
+        self.eta_label = QLabel("")
+        self.eta_label.setObjectName("eta")
+
         self.stdout_display = QTextEdit()
         self.stdout_display.setReadOnly(True)
 
@@ -330,138 +1048,434 @@ class ManimStdoutCapturePage(QWidget):
             Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignCenter,
         )
 
+        v_layout.addWidget(self.eta_label)
+        v_layout.setAlignment(self.eta_label, Qt.AlignmentFlag.AlignCenter)
+
         h_layout_1.addWidget(self.stdout_display)
         h_layout_1.setAlignment(
             self.stdout_display,
             Qt.AlignmentFlag.AlignAbsolute,
         )
 
+        # Every job of this session, including ones queued in bulk
+        self.queue_panel = JobQueuePanel(scheduler)
+        h_layout_1.addWidget(self.queue_panel)
+
         v_layout.addLayout(h_layout_1)
         v_layout.setAlignment(h_layout_1, Qt.AlignmentFlag.AlignAbsolute)
 
-        self.setLayout(v_layout)
-
-        # Initialize QProcess
-        self.process = QProcess(self)
-        self.process.readyReadStandardOutput.connect(self.handle_stdout_output)
-        self.process.readyReadStandardError.connect(self.handle_stderr_output)
+        # Lets the user line up the next array while the video plays, or
+        # fix the input; submitting it supersedes the running render
+        self.new_job_button = QPushButton("New Animation")
+        self.new_job_button.clicked.connect(self.new_job_requested.emit)
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_current)
+        buttons_layout = QHBoxLayout()
+        buttons_layout.addWidget(self.new_job_button)
+        buttons_layout.addWidget(self.cancel_button)
+        v_layout.addLayout(buttons_layout)
+        v_layout.setAlignment(buttons_layout, Qt.AlignmentFlag.AlignCenter)
 
-        self.process.finished.connect(self.on_process_finish)
+        self.setLayout(v_layout)
 
-    def run_manim_process(self, algo):
-        command_test = ["ping", "-c", "4", "archlinux.org"]
-        command_1 = [
-            "docker",
-            "run",
-            "--rm",
-            "-v",
-            "/home/deepy/DEV/SortFlow:/AnimDir",
-            "manimce:latest",
-            "/bin/bash",
-            "-c",
-            "cd /AnimDir/animations/ && manim bubble.py",
-        ]
-        command_2 = [
-            "docker",
-            "run",
-            "--rm",
-            "-v",
-            "/home/deepy/DEV/SortFlow:/AnimDir",
-            "manimce:latest",
-            "/bin/bash",
-            "-c",
-            "cd /AnimDir/animations/ && manim selection.py",
-        ]
-        command_3 = [
-            "docker",
-            "run",
-            "--rm",
-            "-v",
-            "/home/deepy/DEV/SortFlow:/AnimDir",
-            "manimce:latest",
-            "/bin/bash",
-            "-c",
-            "cd /AnimDir/animations/ && manim insertion.py",
-        ]
-
-        # Start the process
-        if algo == "Bubble Sort":
-            self.process.start(command_1[0], command_1[1:])
-        elif algo == "Selection Sort":
-            self.process.start(command_2[0], command_2[1:])
-        elif algo == "Insertion Sort":
-            self.process.start(command_3[0], command_3[1:])
-
-        # Start progress animation (endless)
+        scheduler.log.connect(self.on_job_log)
+        scheduler.job_changed.connect(self.on_job_changed)
+        scheduler.job_finished.connect(self.on_job_finished)
+        scheduler.segment_ready.connect(self.on_segment_ready)
+        self.preview_job = None
+        self.final_job = None
+        self.playing = None  # "preview" or "stream" until the final is done
+        self.streamed_job = None  # held while the player streams from it
+
+    def followed_job(self):
+        """The job whose progress the bar shows: preview, then final."""
+        if self.preview_job is not None and not self.preview_job.finished:
+            return self.preview_job
+        return self.final_job
+
+    def current_jobs(self):
+        return [j for j in (self.preview_job, self.final_job) if j is not None]
+
+    def cancel_current(self):
+        for job in self.current_jobs():
+            self.scheduler.cancel(job)
+
+    def run_manim_process(self, algo, array, options):
+        # New input supersedes whatever this page was still rendering
+        if any(not job.finished for job in self.current_jobs()):
+            self.stdout_display.append("New input, cancelling the old render.")
+            self.cancel_current()
+        algorithm = algorithm_for_job(algo, options)
+        self.preview_job = None
+        self.playing = None
+
+        # Show a quick low quality render first, then the real one.
+        # The preview is queued first so it starts first.
+        if (
+            self.scheduler.cached_video(algorithm, array, options, QUALITY)
+            is None
+        ):
+            self.preview_job = self.scheduler.submit(
+                algorithm, array, options, PREVIEW_QUALITY, PRIORITY_PREVIEW
+            )
+        self.final_job = self.scheduler.submit(
+            algorithm, array, options, QUALITY, PRIORITY_INTERACTIVE
+        )
+        self.cancel_button.setEnabled(not self.final_job.finished)
         self.progress_bar.setValue(0)
         self.progress_bar.setRange(0, 0)  # Endless mode
 
-    def handle_stdout_output(self):
-        stdout_output = bytes(self.process.readAllStandardOutput()).decode(
-            "utf-8"
-        )
-        self.stdout_display.append(stdout_output)
-
-    def handle_stderr_output(self):
-        stderr_output = bytes(self.process.readAllStandardError()).decode(
-            "utf-8"
-        )
-        self.stdout_display.append(stderr_output)
-
-    def on_process_finish(self, exit_code, exit_status):
-        if exit_status == QProcess.ExitStatus.NormalExit:
-            self.stdout_display.append(
-                f"Process finished successfully with exit code: {exit_code}."
-            )
-            time.sleep(5)
-            # Run this: ffmpeg -i input_video.mp4 -c:v libx264 -crf 23 -preset fast output_video.mp4
-            # Trigger FinalPage from here
-            self.manim_process_success.emit()
+    def on_job_log(self, job, text):
+        if job in (self.preview_job, self.final_job):
+            self.stdout_display.append(text)
+
+    def on_job_changed(self, job):
+        if job is not self.followed_job():
+            return
+        if job.fraction is not None:
+            self.progress_bar.setRange(0, 1000)
+            self.progress_bar.setValue(int(job.fraction * 1000))
+        self.eta_label.setText(job.progress_text)
+
+    def on_segment_ready(self, job, path, seconds):
+        if job is not self.final_job or self.playing == "preview":
+            return
+        if self.playing is None:
+            # The real thing is already playable, the preview is moot
+            self.playing = "stream"
+            if self.preview_job is not None:
+                self.scheduler.cancel(self.preview_job)
+            self.scheduler.hold(job)
+            # The player drops an older stream on this, which releases
+            # streamed_job, so only point that at the new job afterwards
+            self.stream_started.emit(path, seconds)
+            self.streamed_job = job
         else:
-            self.stdout_display.append(
-                f"Process crashed with exit code: {exit_code}."
-            )
+            self.segment_ready.emit(path, seconds)
+
+    def on_job_finished(self, job):
+        if job is self.preview_job:
+            # Don't replace the full video if it somehow won the race
+            if (
+                job.status == DONE
+                and self.final_job.status != DONE
+                and self.playing is None
+            ):
+                self.playing = "preview"
+                self.preview_ready.emit(job.video)
+            self.on_job_changed(self.final_job)
+        elif job is self.final_job:
+            if job.status == DONE:
+                # Trigger FinalPage from here
+                self.manim_process_success.emit(job.video)
+            elif self.preview_job is not None:
+                self.scheduler.cancel(self.preview_job)
+            self.cancel_button.setEnabled(False)
+
+    def release_stream(self):
+        """The player dropped the stream, its folder can go."""
+        job, self.streamed_job = self.streamed_job, None
+        if job is None:
+            return
+        self.scheduler.release(job)
+        if job is self.final_job and self.playing == "stream":
+            # Later segments start a new stream, held again
+            self.playing = None
 
     # // ! Continue from here
     @Slot()
-    def start_process(self, algo):
+    def start_process(self, algo, array, options):
         print(
             f"algorithm_selected string recieved by slot start_process: {algo}"
         )
-        self.run_manim_process(algo)
+        self.run_manim_process(algo, array, options)
+
+
+# QtMultimedia takes a while to load and isn't needed before the first
+# video plays, so FinalPage imports these when it's built
+QMediaPlayer = QVideoWidget = None
+
+
+def import_multimedia():
+    global QMediaPlayer, QVideoWidget
+    from PySide6.QtMultimedia import QMediaPlayer
+    from PySide6.QtMultimediaWidgets import QVideoWidget
 
 
 class FinalPage(QWidget):
+    """Plays the rendered videos inside the app.
+
+    Two players take turns: the visible one plays while the hidden one
+    already loads what comes next, so switching is instant. "Next" is
+    the following segment of a render that is still streaming (see
+    ManimStdoutCapturePage.stream_started), the finished video taking
+    over from its preview or stream, or a queued job that finished.
+    """
+
+    new_job_requested = Signal()
+    log_requested = Signal()
+    stream_dropped = Signal()  # the segments aren't played anymore
+
+    SPEEDS = ("0.5x", "1x", "1.5x", "2x")
+
     def __init__(self):
         super().__init__()
+        import_multimedia()
+
+        # One video widget per player, the visible one is on top
+        self.screens = QStackedWidget()
+        self.players = []
+        for _ in range(2):
+            video_widget = QVideoWidget()
+            player = QMediaPlayer(self)
+            player.setVideoOutput(video_widget)
+            player.mediaStatusChanged.connect(
+                lambda status, player=player: self.on_media_status(
+                    player, status
+                )
+            )
+            player.positionChanged.connect(
+                lambda position, player=player: self.on_position(player)
+            )
+            player.playbackStateChanged.connect(self.update_buttons)
+            self.screens.addWidget(video_widget)
+            self.players.append(player)
+        self.active = 0
+        self.standby_path = None
+        self.start_positions = {}  # player -> ms to seek to once loaded
+
+        self.segments = None  # [(path, seconds)] while streaming
+        self.segment_index = 0
+        self.up_next = []  # finished videos to play after this one
+
+        self.play_button = QPushButton("Pause")
+        self.play_button.clicked.connect(self.toggle_pause)
+        replay_button = QPushButton("Replay")
+        replay_button.clicked.connect(self.replay)
+        self.next_button = QPushButton("Next")
+        self.next_button.clicked.connect(self.play_next)
+        self.seek_slider = QSlider(Qt.Orientation.Horizontal)
+        self.seek_slider.sliderMoved.connect(self.seek)
+        self.time_label = QLabel("0:00 / 0:00")
+        self.speed_box = QComboBox()
+        self.speed_box.addItems(self.SPEEDS)
+        self.speed_box.setCurrentText("1x")
+        self.speed_box.currentTextChanged.connect(self.set_speed)
+        log_button = QPushButton("Render Log")
+        log_button.clicked.connect(self.log_requested.emit)
+        new_job_button = QPushButton("New Animation")
+        new_job_button.clicked.connect(self.new_job_requested.emit)
+
+        controls = QHBoxLayout()
+        for widget in (
+            self.play_button,
+            replay_button,
+            self.next_button,
+            self.seek_slider,
+            self.time_label,
+            self.speed_box,
+            log_button,
+            new_job_button,
+        ):
+            controls.addWidget(widget)
 
         layout = QVBoxLayout()
-
+        layout.addWidget(self.screens, 1)
+        layout.addLayout(controls)
         self.setLayout(layout)
+        self.update_buttons()
+
+    @property
+    def player(self):
+        return self.players[self.active]
+
+    @property
+    def standby(self):
+        return self.players[1 - self.active]
+
+    def load_standby(self, path, start=0.0):
+        if path != self.standby_path:
+            self.standby.setSource(QUrl.fromLocalFile(path))
+            self.standby_path = path
+        self.start_positions[self.standby] = int(start * 1000)
+        self.standby.setPosition(int(start * 1000))
+
+    def show_video(self, path, start=0.0):
+        """Bring ``path`` on screen, instantly if it was preloaded."""
+        self.load_standby(path, start)
+        self.player.stop()
+        self.active = 1 - self.active
+        self.standby_path = None
+        self.screens.setCurrentIndex(self.active)
+        self.player.setPlaybackRate(self.speed())
+        self.player.play()
+        self.preload()
+        self.update_buttons()
+
+    def preload(self):
+        """Load whatever plays after the current video into the standby."""
+        if self.segments is not None:
+            if self.segment_index + 1 < len(self.segments):
+                self.load_standby(self.segments[self.segment_index + 1][0])
+        elif self.up_next:
+            self.load_standby(self.up_next[0])
+
+    def drop_stream(self):
+        """Stop streaming; True if there was a stream to drop.
+
+        Callers send ``stream_dropped`` once the next video is on screen,
+        as that may remove the segments.
+        """
+        streaming = self.segments is not None
+        self.segments = None
+        return streaming
+
+    def play(self, video_path):
+        streaming = self.drop_stream()
+        self.show_video(video_path)
+        if streaming:
+            self.stream_dropped.emit()
+
+    def stream(self, segment_path, seconds):
+        streaming = self.drop_stream()
+        self.segments = [(segment_path, seconds)]
+        self.segment_index = 0
+        self.show_video(segment_path)
+        if streaming:
+            self.stream_dropped.emit()
+
+    def append(self, segment_path, seconds):
+        if self.segments is None:
+            self.stream(segment_path, seconds)
+            return
+        self.segments.append((segment_path, seconds))
+        caught_up = (
+            self.player.mediaStatus() == QMediaPlayer.MediaStatus.EndOfMedia
+        )
+        if caught_up and self.segment_index + 2 == len(self.segments):
+            self.next_segment()
+        else:
+            self.preload()
+
+    def next_segment(self):
+        self.segment_index += 1
+        self.show_video(self.segments[self.segment_index][0])
+
+    def swap(self, video_path):
+        """Replace the video, or the stream, at the same position."""
+        position = self.position()
+        streaming = self.drop_stream()
+        self.show_video(video_path, start=position)
+        if streaming:
+            self.stream_dropped.emit()
+
+    def enqueue(self, video_path):
+        self.up_next.append(video_path)
+        if len(self.up_next) == 1 and self.segments is None:
+            self.preload()
+        self.update_buttons()
+
+    def play_next(self):
+        if self.up_next:
+            self.play(self.up_next.pop(0))
+
+    def position(self):
+        """Seconds into the video, counting streamed segments before."""
+        position = self.player.position() / 1000
+        if self.segments is not None:
+            position += sum(
+                seconds for _, seconds in self.segments[: self.segment_index]
+            )
+        return position
+
+    def duration(self):
+        if self.segments is not None:
+            return sum(seconds for _, seconds in self.segments)
+        return self.player.duration() / 1000
+
+    def seek(self, value):
+        position = value / 1000
+        if self.segments is None:
+            self.player.setPosition(int(position * 1000))
+            return
+        for index, (path, seconds) in enumerate(self.segments):
+            if position < seconds or index == len(self.segments) - 1:
+                self.segment_index = index
+                self.show_video(path, start=min(position, seconds))
+                return
+            position -= seconds
+
+    def replay(self):
+        self.seek(0)
+        self.player.play()
 
-        # Setting up the video player
-        self.video_widget = QVideoWidget()
-        self.player = QMediaPlayer(self)
-        self.player.setVideoOutput(self.video_widget)
-
-        layout.addWidget(self.video_widget)
-        self.video_widget.show()
+    def toggle_pause(self):
+        if (
+            self.player.playbackState()
+            == QMediaPlayer.PlaybackState.PlayingState
+        ):
+            self.player.pause()
+        else:
+            self.player.play()
+
+    def speed(self):
+        return float(self.speed_box.currentText().rstrip("x"))
+
+    def set_speed(self, text):
+        self.player.setPlaybackRate(self.speed())
+
+    def on_media_status(self, player, status):
+        if status == QMediaPlayer.MediaStatus.LoadedMedia:
+            start = self.start_positions.pop(player, 0)
+            if start:
+                player.setPosition(start)
+        elif (
+            status == QMediaPlayer.MediaStatus.EndOfMedia
+            and player is self.player
+        ):
+            if self.segments is not None:
+                if self.segment_index + 1 < len(self.segments):
+                    self.next_segment()
+                # else wait for the renderer, see append
+            else:
+                self.play_next()
+
+    def on_position(self, player):
+        if player is not self.player:
+            return
+        position, duration = self.position(), self.duration()
+        self.seek_slider.setRange(0, int(duration * 1000))
+        if not self.seek_slider.isSliderDown():
+            self.seek_slider.setValue(int(position * 1000))
+        self.time_label.setText(
+            f"{format_seconds(position)} / {format_seconds(duration)}"
+        )
 
-        # Load a placeholder video file
-        self.player.setSource(
-            QUrl(
-                "animations/media/videos/array_visual/1080p60/ProceduralArrayVisual.mp4"
-            )
+    def update_buttons(self):
+        playing = (
+            self.player.playbackState()
+            == QMediaPlayer.PlaybackState.PlayingState
         )
+        self.play_button.setText("Pause" if playing else "Play")
+        self.next_button.setEnabled(bool(self.up_next))
 
-    @Slot()
-    def startPlaying(self):
-        self.player.play()
+    def stop_playback(self):
+        for player in self.players:
+            player.stop()
+        if self.drop_stream():
+            self.stream_dropped.emit()
+
+
+def format_seconds(seconds):
+    minutes, seconds = divmod(int(seconds), 60)
+    return f"{minutes}:{seconds:02d}"
 
 
 class SortFlowApp(QWidget):
-    start_video_signal = Signal()
-    start_manim_signal = Signal(str)
+    """The wizard; every page but the first is built when it's needed."""
+
+    start_manim_signal = Signal(str, list, dict)
 
     def __init__(self):
         super().__init__()
@@ -470,79 +1484,197 @@ class SortFlowApp(QWidget):
 
         # Create stacked widget to hold different pages
         self.stacked_widget = QStackedWidget()
+        self.pages = {}  # name -> page, see page()
 
-        # Initialize the pages
-        self.main_page = MainPage()
-        self.algorithm_page = AlgorithmPage()
-        self.input_page = InputPage()
-        self.manim_process_page = ManimStdoutCapturePage()
-        self.final_page = FinalPage()
-
-        # Add pages to the stacked widget
-        self.stacked_widget.addWidget(self.main_page)
-        self.stacked_widget.addWidget(self.algorithm_page)
-        self.stacked_widget.addWidget(self.input_page)
-        self.stacked_widget.addWidget(self.manim_process_page)
-        self.stacked_widget.addWidget(self.final_page)
+        self.scheduler = RenderScheduler(self)
+        self.scheduler.job_finished.connect(self.on_job_finished)
 
         layout = QVBoxLayout()
         layout.addWidget(self.stacked_widget)
         self.setLayout(layout)
+        self.stacked_widget.setCurrentWidget(self.main_page)
 
-        # Connect signals
-        self.main_page.start_clicked.connect(self.show_algorithm_page)
-        self.algorithm_page.algorithm_selected.connect(self.show_input_page)
-        self.input_page.input_done.connect(self.show_manim_progress_page)
-        # self.manim_process_page.manim_process_success.connect(
-        #     self.show_final_page
-        # )
-        self.manim_process_page.manim_process_success.connect(self.fire_mpv)
-
-        self.start_manim_signal.connect(self.manim_process_page.start_process)
-        self.start_video_signal.connect(self.final_page.startPlaying)
+        # Warm up the render worker while the user picks an algorithm
+        self.render_worker = QProcess(self)
+        self.render_worker.setWorkingDirectory(REPO_DIR)
+        self.render_worker.setProcessChannelMode(
+            QProcess.ProcessChannelMode.ForwardedChannels
+        )
+        self.start_render_worker()
+
+    def page(self, name):
+        """The page called ``name``, built by ``build_<name>`` on first use."""
+        page = self.pages.get(name)
+        if page is None:
+            page = self.pages[name] = getattr(self, f"build_{name}")()
+            self.stacked_widget.addWidget(page)
+        return page
+
+    @property
+    def main_page(self):
+        return self.page("main_page")
+
+    @property
+    def algorithm_page(self):
+        return self.page("algorithm_page")
+
+    @property
+    def input_page(self):
+        return self.page("input_page")
+
+    @property
+    def manim_process_page(self):
+        return self.page("manim_process_page")
+
+    @property
+    def final_page(self):
+        return self.page("final_page")
+
+    def build_main_page(self):
+        page = MainPage()
+        page.start_clicked.connect(self.show_algorithm_page)
+        return page
+
+    def build_algorithm_page(self):
+        page = AlgorithmPage()
+        page.algorithm_selected.connect(self.show_input_page)
+        return page
+
+    def build_input_page(self):
+        page = InputPage()
+        page.input_done.connect(self.show_manim_progress_page)
+        page.queue_requested.connect(self.queue_job)
+        page.show_queue_requested.connect(self.show_queue)
+        return page
+
+    def build_manim_process_page(self):
+        page = ManimStdoutCapturePage(self.scheduler)
+        page.queue_panel.play_requested.connect(self.play_video)
+        page.manim_process_success.connect(self.play_final_video)
+        page.preview_ready.connect(self.play_preview)
+        page.stream_started.connect(self.play_stream)
+        # The player page only gets built once there is something to play
+        page.segment_ready.connect(
+            lambda path, seconds: self.final_page.append(path, seconds)
+        )
+        page.new_job_requested.connect(self.show_input_page_again)
+        self.start_manim_signal.connect(page.start_process)
+        return page
+
+    def build_final_page(self):
+        page = FinalPage()
+        page.new_job_requested.connect(self.show_input_page_again)
+        page.log_requested.connect(self.show_queue)
+        page.stream_dropped.connect(self.manim_process_page.release_stream)
+        return page
+
+    def start_render_worker(self):
+        if os.environ.get("SORTFLOW_WORKER") == "local":
+            command = [sys.executable, "-m", "sortflow.worker"]
+        else:
+            command = docker_command("python", "-m", "sortflow.worker")
+        self.render_worker.start(command[0], command[1:])
+
+    def closeEvent(self, event):
+        # Containers outlive the GUI unless they are killed by name
+        self.scheduler.cancel_all()
+        if "final_page" in self.pages:
+            self.final_page.stop_playback()
+        # Running transcodes finish, queued ones are dropped
+        self.scheduler.transcoder.shutdown(wait=False)
+        self.render_worker.terminate()
+        self.render_worker.waitForFinished(3000)
+        super().closeEvent(event)
 
     def show_algorithm_page(self):
         self.stacked_widget.setCurrentWidget(self.algorithm_page)
 
     def show_input_page(self, selected_algorithm):
-        self.selected_algorithm = selected_algorithm
+        self.input_page.set_algorithm(selected_algorithm)
         self.stacked_widget.setCurrentWidget(self.input_page)
 
-    def show_manim_progress_page(self):
+    def show_input_page_again(self):
+        self.stacked_widget.setCurrentWidget(self.input_page)
+
+    def queue_job(self, algorithm, array, options):
+        self.scheduler.submit(
+            algorithm_for_job(algorithm, options),
+            array,
+            options,
+            QUALITY,
+            PRIORITY_BATCH,
+        )
+
+    def show_queue(self):
         self.stacked_widget.setCurrentWidget(self.manim_process_page)
-        self.start_manim_signal.emit(self.selected_algorithm)
 
-    def show_final_page(self):
+    def show_manim_progress_page(self, algorithm, array, options):
+        self.stacked_widget.setCurrentWidget(self.manim_process_page)
+        self.start_manim_signal.emit(algorithm, array, options)
 
+    def show_final_page(self):
+        # Don't pull the user away from entering the next array
+        if self.stacked_widget.currentWidget() is self.pages.get(
+            "manim_process_page"
+        ):
+            self.stacked_widget.setCurrentWidget(self.final_page)
+
+    def play_video(self, video_path):
+        self.final_page.play(video_path)
         self.stacked_widget.setCurrentWidget(self.final_page)
-        self.start_video_signal.emit()
-
-    def fire_mpv(self):
-        if self.selected_algorithm == "Bubble Sort":
-            subprocess.run(
-                [
-                    "mpv",
-                    "animations/media/videos/bubble/1080p60/BubbleSort.mp4",
-                ]
-            )
-        elif self.selected_algorithm == "Selection Sort":
-            subprocess.run(
-                [
-                    "mpv",
-                    "animations/media/videos/selection/1080p60/SelectionSort.mp4",
-                ]
-            )
-        elif self.selected_algorithm == "Insertion Sort":
-            subprocess.run(
-                [
-                    "mpv",
-                    "animations/media/videos/insertion/1080p60/InsertionSort.mp4",
-                ]
-            )
+
+    def play_preview(self, video_path):
+        self.final_page.play(video_path)
+        self.show_final_page()
+
+    def play_stream(self, segment_path, seconds):
+        self.final_page.stream(segment_path, seconds)
+        self.show_final_page()
+
+    def play_final_video(self, video_path):
+        # Takes over from the preview or stream at the same position
+        self.final_page.swap(video_path)
+        self.show_final_page()
+
+    def on_job_finished(self, job):
+        # Background jobs line up behind whatever is playing
+        if job.background and job.status == DONE:
+            self.final_page.enqueue(job.video)
+
+
+def seconds_since_launch():
+    """Seconds since this process started, or None off Linux."""
+    try:
+        with open("/proc/self/stat") as f:
+            # Field 22 is the start time in clock ticks after boot; count
+            # from the end of the command name, which may contain spaces
+            start_ticks = int(f.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    return uptime - start_ticks / os.sysconf("SC_CLK_TCK")
+
+
+def report_startup(app):
+    """Print how long it took until the window could be used.
+
+    Runs from the event loop once the shown window got its first turn,
+    so interpreter start-up and imports are included. With
+    ``--startup-time`` the app quits right after, so cold starts can be
+    timed from a script.
+    """
+    seconds = seconds_since_launch()
+    if seconds is not None:
+        print(f"SortFlow ready after {seconds:.2f}s", file=sys.stderr)
+    if "--startup-time" in sys.argv:
+        app.quit()
 
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
+    app.setStyleSheet(STYLE_SHEET)
     window = SortFlowApp()
     window.show()
+    QTimer.singleShot(0, lambda: report_startup(app))
     sys.exit(app.exec())
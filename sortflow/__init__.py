@@ -0,0 +1 @@
+"""Render pipeline helpers shared by the SortFlow GUI."""
@@ -0,0 +1,5 @@
+import sys
+
+from sortflow.cli import main
+
+sys.exit(main())
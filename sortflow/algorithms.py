@@ -0,0 +1,137 @@
+import os
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANIMATIONS_DIR = os.path.join(REPO_DIR, "animations")
+
+# Manim's default (-qh) output folder name
+QUALITY = "1080p60"
+# Quick first render shown while QUALITY renders in the background
+PREVIEW_QUALITY = "480p15"
+
+# Output folder name -> manim ``quality`` config value
+MANIM_QUALITIES = {
+    "480p15": "low_quality",
+    "720p30": "medium_quality",
+    "1080p60": "high_quality",
+    "1440p60": "production_quality",
+    "2160p60": "fourk_quality",
+}
+
+# Output folder name -> ``manim --quality`` command line flag
+MANIM_QUALITY_FLAGS = {
+    "480p15": "l",
+    "720p30": "m",
+    "1080p60": "h",
+    "1440p60": "p",
+    "2160p60": "k",
+}
+
+
+# How the array is drawn: the detailed scenes, or the bar chart engine
+# in animations/bars.py that stays fast for thousands of elements
+VIEWS = ("cells", "bars")
+
+# What draws the frames: manim (pretty), or sortflow/raster.py which
+# fills NumPy frames and pipes them to ffmpeg (fast, plain bars only)
+ENGINES = ("manim", "raster")
+
+
+class Algorithm:
+    def __init__(self, name, slug, module, scene, engine="manim"):
+        self.name = name  # label shown in the GUI combo box
+        self.slug = slug  # short name used on the command line
+        self.module = module  # file name inside animations/
+        self.scene = scene  # Scene subclass rendered by manim
+        self.engine = engine  # one of ENGINES
+
+    def with_view(self, view):
+        """The same sort drawn in another view, see VIEWS."""
+        if view == "bars":
+            return Algorithm(
+                self.name,
+                self.slug,
+                "bars.py",
+                f"{self.scene}Bars",
+                self.engine,
+            )
+        return self
+
+    def with_engine(self, engine):
+        """The same sort rendered by another engine, see ENGINES."""
+        return Algorithm(
+            self.name, self.slug, self.module, self.scene, engine
+        )
+
+    @property
+    def source_path(self):
+        return os.path.join(ANIMATIONS_DIR, self.module)
+
+    def output_path(self, quality=QUALITY, media_dir=None):
+        """Where the engine writes the finished video for this scene."""
+        if self.engine == "raster":
+            folder = "raster"
+        else:
+            folder = os.path.splitext(self.module)[0]
+        return os.path.join(
+            media_dir or os.path.join(ANIMATIONS_DIR, "media"),
+            "videos",
+            folder,
+            quality,
+            f"{self.scene}.mp4",
+        )
+
+
+ALGORITHMS = {
+    "Bubble Sort": Algorithm(
+        "Bubble Sort", "bubble", "bubble.py", "BubbleSort"
+    ),
+    "Selection Sort": Algorithm(
+        "Selection Sort", "selection", "selection.py", "SelectionSort"
+    ),
+    "Insertion Sort": Algorithm(
+        "Insertion Sort", "insertion", "insertion.py", "InsertionSort"
+    ),
+}
+
+
+def get_algorithm(name, view="cells", engine="manim"):
+    """Look an algorithm up by GUI label (``Bubble Sort``) or slug."""
+    if engine == "raster":
+        # The raster engine always draws bars, whatever the view says,
+        # so it writes the same video under the same name for both
+        view = "cells"
+    for algo in ALGORITHMS.values():
+        if name in (algo.name, algo.slug):
+            return algo.with_view(view).with_engine(engine)
+    raise KeyError(f"Unknown algorithm: {name}")
+
+
+def algorithm_for_job(name, options):
+    """Resolve ``name`` with the view and engine picked in a job spec."""
+    return get_algorithm(
+        name, options.get("view", "cells"), options.get("engine", "manim")
+    )
+
+
+def scene_sources(algo):
+    """Source files whose content decides what a scene renders.
+
+    That is the scene module itself plus every shared helper module in
+    animations/, but not the other scenes or the generated user array.
+    The raster engine only depends on the traces and its own module.
+    """
+    if algo.engine == "raster":
+        return [
+            os.path.join(ANIMATIONS_DIR, "sort_trace.py"),
+            os.path.join(REPO_DIR, "sortflow", "raster.py"),
+        ]
+    other_scenes = {
+        a.module for a in ALGORITHMS.values() if a.module != algo.module
+    }
+    return sorted(
+        os.path.join(ANIMATIONS_DIR, f)
+        for f in os.listdir(ANIMATIONS_DIR)
+        if f.endswith(".py")
+        and f not in other_scenes
+        and f != "user_array.py"
+    )
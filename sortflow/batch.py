@@ -0,0 +1,225 @@
+import ast
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from sortflow.algorithms import QUALITY
+from sortflow.cache import RenderCache
+from sortflow.transcode import TranscodePool
+from sortflow.video import concat_videos
+
+
+def parse_array(text):
+    """Parse ``3, 1, 2`` (or ``[3, 1, 2]``) the same way the GUI does."""
+    text = text.strip()
+    if not text.startswith("["):
+        text = "[" + text + "]"
+    array = ast.literal_eval(text)
+    if not isinstance(array, list):
+        raise ValueError(f"Not a list: {text}")
+    return array
+
+
+def read_arrays(path):
+    """One array per line, blank lines and ``#`` comments are skipped."""
+    arrays = []
+    with open(path) as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                arrays.append(parse_array(line))
+    return arrays
+
+
+def _render_job(algo, array, quality, media_dir, options):
+    # Runs in a pool process; manim stays imported between jobs
+    from sortflow.render import render_scene
+
+    start = time.perf_counter()
+    video = render_scene(
+        algo, quality, array=array, media_dir=media_dir, options=options
+    )
+    return video, time.perf_counter() - start
+
+
+def render_batch(
+    algos,
+    arrays,
+    out_dir,
+    jobs=None,
+    quality=QUALITY,
+    use_cache=True,
+    options=None,
+    chunks=1,
+    transcode=None,
+    profile=False,
+):
+    """Render every (algorithm, array) pair and write ``manifest.json``.
+
+    ``options`` is the job spec passed to every scene (see job_spec.py).
+    Each pair gets its own manim media folder under ``out_dir/.media`` so
+    the pool processes never write to the same partial movie files. The
+    finished videos are moved to ``out_dir/<slug>-<index>.mp4``.
+
+    With ``chunks`` above 1 every video is split into that many runs of
+    passes, rendered by separate pool processes and joined afterwards,
+    so even a single long video keeps all the workers busy.
+
+    ``transcode`` (transcode.TranscodeSettings) also writes a compact
+    copy of every video to ``out_dir/compact/`` on a background pool
+    while the renders go on; the manifest records what each one saved.
+
+    ``profile`` writes a Chrome trace of every render next to its video,
+    as ``<slug>-<index>.trace.json`` (see animations/profiler.py).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    cache = RenderCache() if use_cache else None
+    options = options or {}
+    batch_start = time.perf_counter()
+    entries = []
+    futures = {}
+    parts = {}  # id(entry) -> chunk videos, None until rendered
+    transcoder = TranscodePool() if transcode is not None else None
+    transcodes = []  # (entry, future)
+
+    def distribute(entry):
+        if transcoder is None:
+            return
+        compact = os.path.join(
+            out_dir, "compact", os.path.basename(entry["output"])
+        )
+        transcodes.append(
+            (
+                entry,
+                transcoder.submit(
+                    entry["output"],
+                    compact,
+                    transcode,
+                    algorithm=entry["algorithm"],
+                ),
+            )
+        )
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        for algo in algos:
+            for index, array in enumerate(arrays):
+                name = f"{algo.slug}-{index:04d}"
+                entry = {
+                    "algorithm": algo.name,
+                    "array": array,
+                    "quality": quality,
+                    "output": os.path.join(out_dir, f"{name}.mp4"),
+                }
+                entries.append(entry)
+
+                if cache is not None:
+                    entry["cache_key"] = cache.key(
+                        algo, array, quality, **options
+                    )
+                    cached_video = cache.get(entry["cache_key"])
+                    if cached_video is not None:
+                        shutil.copyfile(cached_video, entry["output"])
+                        entry.update(status="cached", seconds=0.0)
+                        distribute(entry)
+                        continue
+
+                media_dir = os.path.join(out_dir, ".media", name)
+                trace_path = os.path.abspath(
+                    os.path.join(out_dir, f"{name}.trace.json")
+                )
+                job = dict(options, profile=trace_path) if profile else options
+                # The bar view and the raster engine draw the whole trace
+                # in one go, there is nothing to split
+                chunkable = algo.engine == "manim" and algo.module != "bars.py"
+                if chunks <= 1 or not chunkable:
+                    future = pool.submit(
+                        _render_job, algo, array, quality, media_dir, job
+                    )
+                    futures[future] = entry, None
+                    continue
+                parts[id(entry)] = [None] * chunks
+                for chunk in range(chunks):
+                    chunk_job = dict(
+                        job, chunk={"index": chunk, "count": chunks}
+                    )
+                    if profile:
+                        chunk_job["profile"] = trace_path.replace(
+                            ".trace.json", f"-chunk-{chunk}.trace.json"
+                        )
+                    future = pool.submit(
+                        _render_job,
+                        algo,
+                        array,
+                        quality,
+                        os.path.join(media_dir, f"chunk-{chunk}"),
+                        chunk_job,
+                    )
+                    futures[future] = entry, chunk
+
+        for future in as_completed(futures):
+            entry, chunk = futures[future]
+            if entry.get("status") == "failed":
+                continue  # another chunk of this video already failed
+            try:
+                video, seconds = future.result()
+            except Exception as e:
+                entry.update(status="failed", error=repr(e))
+                print(f"FAILED {entry['output']}: {e!r}", flush=True)
+                continue
+            if chunk is not None:
+                chunk_videos = parts[id(entry)]
+                chunk_videos[chunk] = video
+                entry["seconds"] = entry.get("seconds", 0.0) + seconds
+                if None in chunk_videos:
+                    continue
+                # Chunks without any plays of their own write no video
+                concat_videos(
+                    [v for v in chunk_videos if os.path.exists(v)],
+                    entry["output"],
+                )
+                seconds = entry["seconds"]
+            else:
+                shutil.move(video, entry["output"])
+            if cache is not None:
+                cache.put(entry["cache_key"], entry["output"])
+            entry.update(status="done", seconds=round(seconds, 3))
+            print(f"{entry['output']} ({seconds:.1f}s)", flush=True)
+            distribute(entry)
+    wall_seconds = time.perf_counter() - batch_start
+
+    for entry, future in transcodes:
+        try:
+            record = future.result()
+        except Exception as e:
+            entry["transcode"] = {"status": "failed", "error": repr(e)}
+            print(f"FAILED compact copy of {entry['output']}: {e!r}")
+            continue
+        entry["transcode"] = {
+            key: record[key]
+            for key in (
+                "output",
+                "input_bytes",
+                "output_bytes",
+                "saved_bytes",
+                "saved_percent",
+                "encode_seconds",
+            )
+        }
+    if transcoder is not None:
+        transcoder.shutdown()
+
+    shutil.rmtree(os.path.join(out_dir, ".media"), ignore_errors=True)
+    manifest = {
+        "quality": quality,
+        "options": options,
+        "jobs": jobs or os.cpu_count(),
+        "chunks": chunks,
+        "transcode": transcode.as_dict() if transcode is not None else None,
+        "wall_seconds": round(wall_seconds, 3),
+        "renders": entries,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "w") as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
@@ -0,0 +1,185 @@
+"""Render benchmarks: how long the scenes take and how that scales with n.
+
+``run_benchmarks`` renders every algorithm for every (size, shape) pair
+and returns the results that ``sortflow bench`` writes to a JSON file:
+
+    {"quality": "480p15", "options": {}, ...,
+     "runs": [{"algorithm": "bubble", "size": 8, "shape": "random",
+               "wall_seconds": 9.2, "construct_seconds": 8.1,
+               "plays": 61, "frames": 540, "partial_movies": 61,
+               "peak_rss_mb": 412.0, "output_bytes": 301230}, ...]}
+
+Every run is a fresh process with its own empty caches, so runs don't
+speed each other up and the peak RSS is that render's alone.
+``compare`` checks results against a stored baseline.
+"""
+
+import os
+import platform
+import random
+import resource
+import shutil
+import statistics
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+
+from sortflow.algorithms import PREVIEW_QUALITY
+
+SHAPES = ("sorted", "reversed", "random", "duplicates")
+DEFAULT_SIZES = (4, 8, 16)
+
+# Counted metrics must not grow at all; timings, memory and file size
+# only count as a regression once they grow by more than the threshold
+COUNTED = ("plays", "frames", "partial_movies")
+MEASURED = ("wall_seconds", "construct_seconds", "peak_rss_mb", "output_bytes")
+
+
+def make_array(size, shape, seed=0):
+    """A reproducible input of ``size`` values with the given shape."""
+    rng = random.Random(f"{seed}-{size}-{shape}")
+    if shape == "sorted":
+        return list(range(1, size + 1))
+    if shape == "reversed":
+        return list(range(size, 0, -1))
+    if shape == "random":
+        return rng.sample(range(1, size + 1), size)
+    if shape == "duplicates":
+        return [rng.randint(1, max(2, size // 4)) for _ in range(size)]
+    raise ValueError(f"Unknown shape: {shape}")
+
+
+def _bench_run(algo, array, quality, options):
+    # Runs in a fresh process, see run_benchmarks
+    work_dir = tempfile.mkdtemp(prefix="sortflow-bench-")
+    # Cold caches: segments.py reads this when the scene is imported
+    os.environ["SORTFLOW_CACHE_DIR"] = os.path.join(work_dir, "cache")
+    from sortflow.render import render_scene
+
+    try:
+        stats = {}
+        start = time.perf_counter()
+        video = render_scene(
+            algo,
+            quality,
+            array=array,
+            media_dir=os.path.join(work_dir, "media"),
+            options=options,
+            stats=stats,
+        )
+        stats["wall_seconds"] = time.perf_counter() - start
+        stats["output_bytes"] = os.path.getsize(video)
+        # ru_maxrss is in KiB on Linux
+        usage = resource.getrusage(resource.RUSAGE_SELF)
+        stats["peak_rss_mb"] = usage.ru_maxrss / 1024
+        return stats
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def run_benchmarks(
+    algos,
+    sizes=DEFAULT_SIZES,
+    shapes=SHAPES,
+    quality=PREVIEW_QUALITY,
+    options=None,
+    repeat=1,
+):
+    """Render every combination ``repeat`` times, one after the other.
+
+    Each metric is the median over the repeats. Runs that fail are kept
+    with their ``error`` so a broken scene shows up in the results.
+    """
+    options = options or {}
+    runs = []
+    for algo in algos:
+        for size in sizes:
+            for shape in shapes:
+                array = make_array(size, shape)
+                run = {"algorithm": algo.slug, "size": size, "shape": shape}
+                samples = []
+                try:
+                    for _ in range(repeat):
+                        with ProcessPoolExecutor(
+                            max_workers=1, mp_context=get_context("spawn")
+                        ) as pool:
+                            samples.append(
+                                pool.submit(
+                                    _bench_run, algo, array, quality, options
+                                ).result()
+                            )
+                except Exception as e:
+                    run["error"] = repr(e)
+                for metric in COUNTED + MEASURED:
+                    values = [
+                        s[metric] for s in samples if s.get(metric) is not None
+                    ]
+                    if values:
+                        run[metric] = round(statistics.median(values), 3)
+                runs.append(run)
+                print(describe_run(run), flush=True)
+    return {
+        "created": time.time(),
+        "host": platform.node(),
+        "python": platform.python_version(),
+        "quality": quality,
+        "options": options,
+        "repeat": repeat,
+        "runs": runs,
+    }
+
+
+def describe_run(run):
+    name = f"{run['algorithm']} n={run['size']} {run['shape']}"
+    if "error" in run:
+        return f"{name}: FAILED {run['error']}"
+    return (
+        f"{name}: {run['wall_seconds']:.2f}s, "
+        f"{run.get('plays', '?')} plays, {run['frames']} frames, "
+        f"{run['peak_rss_mb']:.0f} MB"
+    )
+
+
+def _run_key(run):
+    return run["algorithm"], run["size"], run["shape"]
+
+
+def compare(baseline, results, threshold=0.1):
+    """Regressions of ``results`` against ``baseline``, as text lines.
+
+    Only runs present in both are compared. A counted metric regresses
+    when it grows at all, a measured one when it grows by more than
+    ``threshold`` (0.1 is 10%). A run that used to work but now fails
+    is a regression as well.
+    """
+    if (baseline["quality"], baseline["options"]) != (
+        results["quality"],
+        results["options"],
+    ):
+        raise ValueError(
+            "Baseline was rendered with other settings: "
+            f"{baseline['quality']} {baseline['options']}"
+        )
+    old_runs = {_run_key(run): run for run in baseline["runs"]}
+    regressions = []
+    for run in results["runs"]:
+        old = old_runs.get(_run_key(run))
+        if old is None:
+            continue
+        name = "{} n={} {}".format(*_run_key(run))
+        if "error" in run and "error" not in old:
+            regressions.append(f"{name}: now fails with {run['error']}")
+            continue
+        for metric in COUNTED + MEASURED:
+            before, after = old.get(metric), run.get(metric)
+            if before is None or after is None:
+                continue
+            allowed = before if metric in COUNTED else before * (1 + threshold)
+            if after > allowed:
+                change = (after - before) / before * 100 if before else 100.0
+                regressions.append(
+                    f"{name}: {metric} {before:g} -> {after:g} "
+                    f"(+{change:.0f}%)"
+                )
+    return regressions
@@ -0,0 +1,154 @@
+import fcntl
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from contextlib import contextmanager
+
+from sortflow.algorithms import QUALITY, REPO_DIR, scene_sources
+
+DEFAULT_CACHE_DIR = os.environ.get(
+    "SORTFLOW_CACHE_DIR", os.path.join(REPO_DIR, ".sortflow_cache")
+)
+DEFAULT_MAX_BYTES = int(
+    os.environ.get("SORTFLOW_CACHE_MAX_BYTES", 2 * 1024**3)
+)
+
+
+def _hash_file(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(65536), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RenderCache:
+    """Content-addressed store of finished videos with LRU eviction.
+
+    Videos live in ``<root>/<key>.mp4`` and ``<root>/index.json`` keeps
+    their size and last access time. Once the total size goes above
+    ``max_bytes`` the least recently used videos are removed.
+
+    The GUI, batch renders and the render service all share the folder,
+    so the index is read again under a file lock before every change
+    and written back before the lock is released.
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.index_path = os.path.join(root, "index.json")
+        self.lock_path = os.path.join(root, "index.lock")
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+        self._index = self._load_index()
+
+    @contextmanager
+    def _locked_index(self):
+        """The index as other processes left it, saved again afterwards."""
+        with self._lock, open(self.lock_path, "a") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                self._index = self._load_index()
+                yield self._index
+                self._save_index()
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _load_index(self):
+        try:
+            with open(self.index_path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self._index, f, indent=1)
+        os.replace(tmp_path, self.index_path)
+
+    def key(self, algo, array, quality=QUALITY, **settings):
+        """Hash everything that changes the rendered video."""
+        settings.pop("engine", None)  # algo.engine is the one that renders
+        if algo.engine == "raster":
+            settings.pop("view", None)  # same bars either way
+        payload = {
+            "scene": algo.scene,
+            "engine": algo.engine,
+            "array": list(array),
+            "quality": quality,
+            "settings": settings,
+            "sources": {
+                os.path.basename(p): _hash_file(p)
+                for p in scene_sources(algo)
+            },
+        }
+        encoded = json.dumps(payload, sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.root, f"{key}.mp4")
+
+    def get(self, key):
+        """Return the cached video path for ``key`` or None on a miss."""
+        with self._locked_index() as index:
+            entry = index.get(key)
+            if entry is None:
+                return None
+            path = self.path_for(key)
+            if not os.path.exists(path):
+                # Someone cleaned the folder behind our back
+                del index[key]
+                return None
+            entry["last_used"] = time.time()
+            return path
+
+    def put(self, key, video_path):
+        """Copy a freshly rendered video into the cache and return its path."""
+        path = self.path_for(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.part"
+        shutil.copyfile(video_path, tmp_path)
+        os.replace(tmp_path, path)
+        with self._locked_index() as index:
+            index[key] = {
+                "size": os.path.getsize(path),
+                "last_used": time.time(),
+            }
+            self._adopt_orphans()
+            self._evict(keep=key)
+        return path
+
+    def total_bytes(self):
+        return sum(entry["size"] for entry in self._index.values())
+
+    def _adopt_orphans(self):
+        # Videos whose index entry got lost still count towards max_bytes
+        for name in os.listdir(self.root):
+            key, ext = os.path.splitext(name)
+            if ext == ".mp4" and key not in self._index:
+                path = os.path.join(self.root, name)
+                self._index[key] = {
+                    "size": os.path.getsize(path),
+                    "last_used": os.path.getmtime(path),
+                }
+
+    def _evict(self, keep=None):
+        by_age = sorted(
+            self._index.items(), key=lambda item: item[1]["last_used"]
+        )
+        total = self.total_bytes()
+        for key, entry in by_age:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            try:
+                os.remove(self.path_for(key))
+            except FileNotFoundError:
+                pass
+            total -= entry["size"]
+            del self._index[key]
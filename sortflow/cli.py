@@ -0,0 +1,304 @@
+"""Headless entry point: ``python -m sortflow <command> ...``."""
+
+import argparse
+import json
+import sys
+
+from sortflow.algorithms import (
+    ALGORITHMS,
+    ENGINES,
+    MANIM_QUALITIES,
+    PREVIEW_QUALITY,
+    QUALITY,
+    VIEWS,
+    get_algorithm,
+)
+from sortflow.batch import parse_array, read_arrays, render_batch
+from sortflow.bench import DEFAULT_SIZES, SHAPES, compare, run_benchmarks
+from sortflow.service import DEFAULT_PORT, MAX_PENDING, serve
+from sortflow.trace import record
+from sortflow.transcode import TranscodeSettings
+
+
+def job_options(args):
+    """The job spec handed to the scenes, see animations/job_spec.py."""
+    options = {}
+    if args.compact:
+        options["compact"] = True
+    if args.max_animations:
+        options["max_animations"] = args.max_animations
+    if args.target_seconds:
+        options["target_seconds"] = args.target_seconds
+    if args.view != "cells":
+        options["view"] = args.view
+    if args.engine != "manim":
+        options["engine"] = args.engine
+    return options
+
+
+def cmd_render(args):
+    algos = [
+        get_algorithm(name.strip(), args.view, args.engine)
+        for name in args.algo.split(",")
+    ]
+    arrays = read_arrays(args.arrays)
+    manifest = render_batch(
+        algos,
+        arrays,
+        args.out,
+        jobs=args.jobs,
+        quality=args.quality,
+        # A cached video has nothing to profile
+        use_cache=not args.no_cache and not args.profile,
+        options=job_options(args),
+        chunks=args.chunks,
+        transcode=args.transcode,
+        profile=args.profile,
+    )
+    failed = [r for r in manifest["renders"] if r["status"] == "failed"]
+    print(
+        f"Rendered {len(manifest['renders']) - len(failed)} videos "
+        f"in {manifest['wall_seconds']:.1f}s, {len(failed)} failed"
+    )
+    compact = [
+        r["transcode"]
+        for r in manifest["renders"]
+        if "saved_bytes" in r.get("transcode", {})
+    ]
+    if compact:
+        saved = sum(t["saved_bytes"] for t in compact)
+        seconds = sum(t["encode_seconds"] for t in compact)
+        print(
+            f"Compact copies saved {saved / 1e6:.1f} MB "
+            f"in {seconds:.1f}s of encoding"
+        )
+    return 1 if failed else 0
+
+
+def cmd_bench(args):
+    algos = [
+        get_algorithm(name.strip(), args.view, args.engine)
+        for name in args.algo.split(",")
+    ]
+    results = run_benchmarks(
+        algos,
+        sizes=[int(size) for size in args.sizes.split(",")],
+        shapes=args.shapes.split(","),
+        quality=args.quality,
+        options=job_options(args),
+        repeat=args.repeat,
+    )
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Wrote {args.out}")
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        return report_regressions(baseline, results, args.threshold)
+    return 0
+
+
+def cmd_bench_compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.results) as f:
+        results = json.load(f)
+    return report_regressions(baseline, results, args.threshold)
+
+
+def report_regressions(baseline, results, threshold):
+    try:
+        regressions = compare(baseline, results, threshold)
+    except ValueError as e:
+        # Settings that don't match are a usage error, like bad arguments
+        print(f"sortflow: error: {e}", file=sys.stderr)
+        return 2
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print("No regressions against the baseline.")
+    return 1 if regressions else 0
+
+
+def cmd_serve(args):
+    serve(args.host, args.port, args.jobs, args.max_pending)
+    return 0
+
+
+def cmd_trace(args):
+    events = record(get_algorithm(args.algo), parse_array(args.array))
+    for event in events:
+        print(json.dumps(event))
+    return 0
+
+
+def add_job_arguments(parser):
+    """The settings that end up in the job spec, see job_options."""
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="merge small back-to-back animations into fewer plays",
+    )
+    parser.add_argument(
+        "--max-animations",
+        type=int,
+        help="summarize later passes to stay under this many plays",
+    )
+    parser.add_argument(
+        "--target-seconds",
+        type=float,
+        help="summarize later passes to keep the video about this long",
+    )
+    parser.add_argument(
+        "--view",
+        default="cells",
+        choices=VIEWS,
+        help="bars draws a bar chart that stays fast for large arrays",
+    )
+    parser.add_argument(
+        "--engine",
+        default="manim",
+        choices=ENGINES,
+        help="raster skips manim and draws plain bars, much faster",
+    )
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="sortflow")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    render = commands.add_parser(
+        "render", help="render one video per (algorithm, array) pair"
+    )
+    render.add_argument(
+        "--algo",
+        default=",".join(a.slug for a in ALGORITHMS.values()),
+        help="comma separated list, e.g. bubble,selection,insertion",
+    )
+    render.add_argument(
+        "--arrays",
+        required=True,
+        help="text file with one comma separated array per line",
+    )
+    render.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="worker processes (default: one per CPU)",
+    )
+    render.add_argument(
+        "--chunks",
+        type=int,
+        default=1,
+        help="split every video into this many parts rendered in parallel",
+    )
+    render.add_argument("--out", default="renders")
+    render.add_argument(
+        "--quality", default=QUALITY, choices=sorted(MANIM_QUALITIES)
+    )
+    render.add_argument(
+        "--no-cache", action="store_true", help="skip the render cache"
+    )
+    add_job_arguments(render)
+    render.add_argument(
+        "--profile",
+        action="store_true",
+        help="write a Chrome trace of every render to OUT/*.trace.json",
+    )
+    render.add_argument(
+        "--transcode",
+        type=TranscodeSettings.parse,
+        metavar="SETTINGS",
+        help="also write compact copies to OUT/compact, e.g. "
+        "'crf=28,preset=slow,fps=30,max_height=720' or 'default'",
+    )
+    render.set_defaults(func=cmd_render)
+
+    bench = commands.add_parser(
+        "bench", help="time the scenes over a matrix of array sizes and shapes"
+    )
+    bench.add_argument(
+        "--algo",
+        default=",".join(a.slug for a in ALGORITHMS.values()),
+        help="comma separated list, e.g. bubble,selection,insertion",
+    )
+    bench.add_argument(
+        "--sizes",
+        default=",".join(str(size) for size in DEFAULT_SIZES),
+        help="comma separated array sizes",
+    )
+    bench.add_argument(
+        "--shapes",
+        default=",".join(SHAPES),
+        help=f"comma separated, out of {', '.join(SHAPES)}",
+    )
+    bench.add_argument(
+        "--quality", default=PREVIEW_QUALITY, choices=sorted(MANIM_QUALITIES)
+    )
+    bench.add_argument(
+        "--repeat",
+        type=int,
+        default=1,
+        help="render every case this often and keep the medians",
+    )
+    bench.add_argument("--out", default="bench.json")
+    bench.add_argument(
+        "--baseline", help="earlier results to check for regressions"
+    )
+    bench.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="allowed slowdown before it counts, 0.1 is 10%%",
+    )
+    add_job_arguments(bench)
+    bench.set_defaults(func=cmd_bench)
+
+    bench_compare = commands.add_parser(
+        "bench-compare", help="check benchmark results against a baseline"
+    )
+    bench_compare.add_argument("baseline")
+    bench_compare.add_argument("results")
+    bench_compare.add_argument("--threshold", type=float, default=0.1)
+    bench_compare.set_defaults(func=cmd_bench_compare)
+
+    serve_parser = commands.add_parser(
+        "serve", help="render jobs posted to a local HTTP API"
+    )
+    serve_parser.add_argument(
+        "--host",
+        default="127.0.0.1",
+        help="address to listen on (default: this machine only)",
+    )
+    serve_parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    serve_parser.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="renders at once (default: one per two CPUs)",
+    )
+    serve_parser.add_argument(
+        "--max-pending",
+        type=int,
+        default=MAX_PENDING,
+        help="queued jobs before new ones get 503 Retry-After",
+    )
+    serve_parser.set_defaults(func=cmd_serve)
+
+    trace = commands.add_parser(
+        "trace", help="print the event trace of one sort as JSON lines"
+    )
+    trace.add_argument("--algo", required=True)
+    trace.add_argument("array", help="comma separated, e.g. 3,1,2")
+    trace.set_defaults(func=cmd_trace)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
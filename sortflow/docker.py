@@ -0,0 +1,16 @@
+from sortflow.algorithms import REPO_DIR
+
+DOCKER_IMAGE = "manimce:latest"
+MOUNT_DIR = "/AnimDir"  # where REPO_DIR shows up inside the container
+JOB_ENV = "SORTFLOW_JOB"  # see animations/job_spec.py
+
+
+def docker_command(*command, name=None, env=None):
+    """Build a ``docker run`` argv that runs ``command`` on the repo."""
+    argv = ["docker", "run", "--rm", "--init"]
+    if name is not None:
+        argv += ["--name", name]
+    for key, value in (env or {}).items():
+        argv += ["-e", f"{key}={value}"]
+    argv += ["-v", f"{REPO_DIR}:{MOUNT_DIR}", "-w", MOUNT_DIR, DOCKER_IMAGE]
+    return argv + list(command)
@@ -0,0 +1,162 @@
+import os
+import shutil
+import subprocess
+import time
+
+from sortflow.algorithms import REPO_DIR
+from sortflow.docker import MOUNT_DIR, docker_command
+
+JOBS_DIR = ".sortflow_jobs"  # relative to REPO_DIR, like PROGRESS_DIR
+
+
+def new_job_dir(name):
+    """A private, repo-relative output folder for one render job.
+
+    Every job writes its media (partial movies, the finished video) in
+    here, so jobs running at the same time never touch the same files.
+    The path is valid on the host and in the container alike.
+    """
+    path = os.path.join(JOBS_DIR, f"{name}-{time.time_ns()}")
+    # Create it as the GUI user so it can be removed after the container
+    # wrote into it as root
+    os.makedirs(os.path.join(REPO_DIR, path, "media"))
+    return path
+
+
+def media_dir(job_dir):
+    return os.path.join(REPO_DIR, job_dir, "media")
+
+
+def remove_job_dir(job_dir):
+    try:
+        shutil.rmtree(os.path.join(REPO_DIR, job_dir))
+    except FileNotFoundError:
+        pass
+    except PermissionError:
+        # A container wrote in there as root, have one clean up as well
+        subprocess.Popen(
+            docker_command("rm", "-rf", f"{MOUNT_DIR}/{job_dir}"),
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+
+def container_name(job):
+    """Name of the container rendering ``job``, so it can be killed."""
+    return f"sortflow-{os.getpid()}-{job.id}"
+
+
+# Job states shown in the GUI's queue panel
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+# Lower numbers start first: a preview somebody is waiting for, then the
+# full render of what they're watching, then anything queued in bulk
+PRIORITY_PREVIEW = 0
+PRIORITY_INTERACTIVE = 1
+PRIORITY_BATCH = 2
+
+
+def default_concurrency():
+    """How many renders to run at once on this machine.
+
+    A manim render keeps about two cores busy (the scene in Python and
+    ffmpeg encoding next to it).
+    """
+    return max(1, (os.cpu_count() or 1) // 2)
+
+
+class RenderJob:
+    """One video to render: what, how, and where it stands."""
+
+    _next_id = 1
+
+    def __init__(self, algorithm, array, options, quality, priority):
+        self.id = RenderJob._next_id
+        RenderJob._next_id += 1
+        self.algorithm = algorithm  # a resolved algorithms.Algorithm
+        self.array = array
+        self.options = options  # job spec, without the array
+        self.quality = quality
+        self.priority = priority  # what the job is for, never changes
+        self.rank = priority  # where it queues, moving it changes this
+        self.order = float(self.id)  # position among equal ranks
+        self.status = QUEUED
+        self.fraction = None  # done so far, None while unknown
+        self.progress_text = ""  # e.g. the ETA, shown under the bar
+        self.video = None
+        self.distribution = None  # compact copy, see transcode.py
+        self.job_dir = None  # its output folder, while that's on disk
+        self.held = False  # the player still streams from job_dir
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    @property
+    def background(self):
+        """Queued in bulk rather than rendered for what's on screen."""
+        return self.priority == PRIORITY_BATCH
+
+    def describe(self):
+        array = ", ".join(str(value) for value in self.array[:8])
+        if len(self.array) > 8:
+            array += ", ..."
+        return f"{self.algorithm.name} [{array}] {self.quality}"
+
+
+class JobQueue:
+    """Render jobs in the order they should start.
+
+    Only the bookkeeping lives here; the GUI starts and stops the
+    processes and reports back through ``mark``.
+    """
+
+    def __init__(self, max_running=None):
+        self.max_running = max_running or default_concurrency()
+        self.jobs = []  # every job, in submission order
+
+    def submit(self, job):
+        self.jobs.append(job)
+        return job
+
+    def pending(self):
+        queued = [job for job in self.jobs if job.status == QUEUED]
+        return sorted(queued, key=lambda job: (job.rank, job.order))
+
+    def running(self):
+        return [job for job in self.jobs if job.status == RUNNING]
+
+    def next_to_start(self):
+        """The job to start now, or None when all slots are taken."""
+        if len(self.running()) >= self.max_running:
+            return None
+        pending = self.pending()
+        return pending[0] if pending else None
+
+    def move(self, job, steps):
+        """Move a queued job ``steps`` places later (earlier if negative).
+
+        Passing a job of another rank takes over its rank, so a batch
+        job moved to the top really starts next. Its ``priority`` stays,
+        that still says what the job is for.
+        """
+        pending = self.pending()
+        if job not in pending:
+            return
+        index = pending.index(job)
+        target_index = min(max(index + steps, 0), len(pending) - 1)
+        if target_index == index:
+            return
+        target = pending[target_index]
+        job.rank = target.rank
+        job.order = target.order + (0.5 if steps > 0 else -0.5)
+        # Keep the orders whole numbers so the halves never run out
+        for order, queued in enumerate(self.pending()):
+            queued.order = float(order)
+
+    def mark(self, job, status):
+        job.status = status
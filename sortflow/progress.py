@@ -0,0 +1,141 @@
+import json
+import os
+import time
+
+from sortflow.algorithms import REPO_DIR
+from sortflow.cache import DEFAULT_CACHE_DIR
+
+PROGRESS_DIR = ".sortflow_progress"  # relative to REPO_DIR, see below
+DEFAULT_HISTORY_PATH = os.path.join(DEFAULT_CACHE_DIR, "throughput.json")
+
+
+def new_progress_path(name):
+    """A repo-relative events file; valid on the host and in the container."""
+    # Create the folder as the GUI user so it can clean up after the
+    # container, which writes the files as root
+    os.makedirs(os.path.join(REPO_DIR, PROGRESS_DIR), exist_ok=True)
+    return os.path.join(PROGRESS_DIR, f"{name}-{time.time_ns()}.jsonl")
+
+
+def progress_kind(algo, quality, options):
+    """What renders are alike enough to share a ThroughputHistory rate."""
+    kind = f"{algo.slug}-{quality}"
+    for setting in ("view", "engine"):
+        if setting in options:
+            kind += f"-{options[setting]}"
+    if options.get("compact"):
+        kind += "-compact"
+    return kind
+
+
+class EventFileReader:
+    """Reads the JSON lines a scene appends to its progress file."""
+
+    def __init__(self, path):
+        self.path = os.path.join(REPO_DIR, path)
+        self.offset = 0
+        self.buffer = b""
+
+    def read_new(self):
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(self.offset)
+                data = f.read()
+        except FileNotFoundError:
+            return []
+        self.offset += len(data)
+        *lines, self.buffer = (self.buffer + data).split(b"\n")
+        return [json.loads(line) for line in lines if line]
+
+    def remove(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+class ThroughputHistory:
+    """Seconds per animation of earlier renders, per kind of job.
+
+    Kept as an exponential moving average so the estimate follows the
+    machine when it gets faster or slower.
+    """
+
+    SMOOTHING = 0.3
+
+    def __init__(self, path=DEFAULT_HISTORY_PATH):
+        self.path = path
+        try:
+            with open(path) as f:
+                self.rates = json.load(f)
+        except (OSError, ValueError):
+            self.rates = {}
+
+    def seconds_per_animation(self, kind):
+        return self.rates.get(kind)
+
+    def record(self, kind, seconds, animations):
+        if animations <= 0:
+            return
+        rate = seconds / animations
+        old_rate = self.rates.get(kind)
+        if old_rate is not None:
+            rate = self.SMOOTHING * rate + (1 - self.SMOOTHING) * old_rate
+        self.rates[kind] = rate
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, "w") as f:
+            json.dump(self.rates, f, indent=1)
+
+
+class ProgressTracker:
+    """Turns render events into a fraction done and an ETA."""
+
+    def __init__(self, kind, history=None):
+        self.kind = kind
+        self.history = history or ThroughputHistory()
+        self.started = time.time()
+        self.total = None
+        self.done = 0
+        self.phase = "starting"
+
+    def feed(self, event):
+        if event["event"] == "plan":
+            self.total = event["animations"]
+            self.phase = "rendering"
+        elif event["event"] == "animation":
+            self.done = event["index"]
+        elif event["event"] == "encode":
+            self.total = self.done = event["animations"]
+            self.phase = "encoding"
+        elif event["event"] == "finished":
+            self.phase = "finished"
+
+    def fraction(self):
+        """Fraction done, or None while the total is still unknown."""
+        if self.total is None:
+            return None
+        # The plan is an estimate, never claim to be done before encoding
+        return min(self.done / max(self.total, 1), 0.99)
+
+    def seconds_per_animation(self):
+        historical = self.history.seconds_per_animation(self.kind)
+        if self.done < 3:
+            return historical
+        observed = (time.time() - self.started) / self.done
+        if historical is None:
+            return observed
+        # Trust what we see more the further the render gets
+        weight = min(self.done / max(self.total or 1, 1), 1.0)
+        return weight * observed + (1 - weight) * historical
+
+    def eta(self):
+        """Seconds left, or None when there is nothing to base it on."""
+        rate = self.seconds_per_animation()
+        if rate is None or self.total is None:
+            return None
+        return max(self.total - self.done, 0) * rate
+
+    def finish(self):
+        self.history.record(
+            self.kind, time.time() - self.started, self.done or 1
+        )
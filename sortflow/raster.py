@@ -0,0 +1,258 @@
+"""Fast render engine: NumPy frames piped straight into ffmpeg.
+
+Draws the same traces as the manim scenes, but only as plain bars, and
+without a scene graph or vector rasterizer in between. Each frame is
+filled with a handful of vectorized NumPy operations into one reused
+RGB buffer and written to ffmpeg's stdin as raw video.
+
+Run it directly with ``python -m sortflow.raster --algo bubble``; it
+reads the job spec, array included, from SORTFLOW_JOB like the scenes.
+"""
+
+import argparse
+import json
+import math
+import os
+import subprocess
+import time
+
+import numpy as np
+
+from sortflow.algorithms import QUALITY, get_algorithm
+from sortflow.docker import JOB_ENV
+from sortflow.render import RenderCancelled
+from sortflow.trace import record
+
+# trace.py put animations/ on sys.path
+from job_spec import load_array  # noqa: E402
+from profiler import PROFILER  # noqa: E402
+from render_events import RenderEvents  # noqa: E402
+from sort_trace import apply_to_bars  # noqa: E402
+
+# Same colors as manim's BLUE, YELLOW and GREEN on its black background
+COLORS = np.array(
+    [[0x58, 0xC4, 0xDD], [0xFF, 0xFF, 0x00], [0x83, 0xC1, 0x67], [0, 0, 0]],
+    dtype=np.uint8,
+)
+PLAIN, LIT, DONE, GAP = range(4)
+
+
+def frame_size(quality):
+    """Width, height and frame rate for a quality name like ``1080p60``."""
+    height, fps = (int(part) for part in quality.split("p"))
+    width = (height * 16 // 9 + 1) // 2 * 2  # libx264 wants even sizes
+    return width, height, fps
+
+
+class BarFrames:
+    """The bars of an array, drawn into one preallocated RGB frame."""
+
+    def __init__(self, values, width, height):
+        self.values = np.asarray(values, dtype=float)
+        n = len(self.values)
+        self.highlighted = np.zeros(n, dtype=bool)
+        self.done = np.zeros(n, dtype=bool)
+        self.key = None
+
+        self.frame = np.zeros((height, width, 3), dtype=np.uint8)
+        self.left = int(width * 0.04)
+        self.right = width - self.left
+        self.base = height - int(height * 0.05)
+        self.max_height = self.base - int(height * 0.1)
+
+        # Bar index of every pixel column between the margins, n for gaps
+        offsets = np.arange(self.right - self.left)
+        slot = len(offsets) / max(n, 1)
+        bar = np.minimum((offsets / slot).astype(int), max(n - 1, 0))
+        if slot >= 3:  # leave a gap between bars while there is room
+            bar[offsets - bar * slot >= slot * 0.85] = n
+        self.column_bar = bar
+
+        low = min(self.values.min(initial=0.0), 0.0)
+        self.low = low
+        self.span = max(self.values.max(initial=1.0) - low, 1e-9)
+
+        # Scratch buffers reused for every frame
+        self.tops = np.full(n + 1, self.base)
+        self.state = np.full(n + 1, GAP)
+        self.rows = np.arange(self.base)[:, None]
+        self.mask = np.empty((self.base, len(offsets)), dtype=bool)
+
+    def apply(self, events):
+        """Apply trace events; the cells they touch end up highlighted."""
+        apply_to_bars(self, events)
+
+    def draw(self):
+        """Redraw the frame from the current state and return it."""
+        n = len(self.values)
+        # Keep a sliver for the smallest value so every bar is visible
+        heights = 1 + (self.values - self.low) / self.span * (
+            self.max_height - 1
+        )
+        self.tops[:n] = self.base - heights.astype(int)
+        self.state[:n] = np.where(
+            self.highlighted, LIT, np.where(self.done, DONE, PLAIN)
+        )
+
+        np.greater_equal(
+            self.rows, self.tops[self.column_bar][None, :], out=self.mask
+        )
+        area = self.frame[: self.base, self.left : self.right]
+        area[:] = 0
+        colors = COLORS[self.state[self.column_bar]]
+        np.copyto(area, colors[None, :, :], where=self.mask[:, :, None])
+        return self.frame
+
+
+def render_raster(
+    algo,
+    quality=QUALITY,
+    array=None,
+    media_dir=None,
+    options=None,
+    cancel_event=None,
+    stats=None,
+):
+    """Render ``algo`` as bars with NumPy and ffmpeg, return the video.
+
+    Takes the same arguments as render.render_scene. The trace is spread
+    over ``target_seconds`` from the job spec, or about 50 ms per event
+    (5 to 60 seconds) by default, followed by one second of the result.
+    """
+    options = options or {}
+    array = load_array(options) if array is None else list(array)
+    events = record(algo, array)
+    progress = RenderEvents(options.get("progress"))
+
+    width, height, fps = frame_size(quality)
+    seconds = options.get("target_seconds") or min(
+        max(len(events) * 0.05, 5.0), 60.0
+    )
+    sort_frames = max(1, round(seconds * fps))
+    total_frames = sort_frames + fps
+    # Progress is counted in seconds of video
+    progress.emit("plan", animations=math.ceil(total_frames / fps))
+
+    # Bad input fails here, before there is an ffmpeg to clean up
+    start = time.perf_counter()
+    bars = BarFrames(array, width, height)
+    frame = bars.draw()
+
+    if options.get("profile"):
+        PROFILER.start(options["profile"])
+    else:
+        PROFILER.stop()  # e.g. after a profiled job that failed
+    render_start = time.perf_counter()
+
+    path = algo.output_path(quality, media_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    part_path = path + ".part"
+    ffmpeg = None
+    applied = 0
+    try:
+        ffmpeg = subprocess.Popen(
+            [
+                "ffmpeg",
+                "-y",
+                "-loglevel",
+                "error",
+                "-f",
+                "rawvideo",
+                "-pix_fmt",
+                "rgb24",
+                "-s",
+                f"{width}x{height}",
+                "-r",
+                str(fps),
+                "-i",
+                "-",
+                "-c:v",
+                "libx264",
+                "-pix_fmt",
+                "yuv420p",
+                "-movflags",
+                "+faststart",
+                "-f",
+                "mp4",
+                part_path,
+            ],
+            stdin=subprocess.PIPE,
+        )
+        try:
+            for index in range(total_frames):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise RenderCancelled()
+                upto = min(
+                    len(events),
+                    math.ceil((index + 1) * len(events) / sort_frames),
+                )
+                with PROFILER.span("rasterize"):
+                    if index == sort_frames:
+                        bars.done[:] = True
+                        bars.highlighted[:] = False
+                        frame = bars.draw()
+                    elif upto > applied:
+                        bars.apply(events[applied:upto])
+                        applied = upto
+                        frame = bars.draw()
+                # The buffer protocol hands ffmpeg the frame without a copy
+                with PROFILER.span("write"):
+                    ffmpeg.stdin.write(frame)
+                if (index + 1) % fps == 0:
+                    progress.emit("animation", index=(index + 1) // fps)
+            ffmpeg.stdin.close()
+        except BrokenPipeError:
+            pass  # ffmpeg died, its exit code says why
+        # What ffmpeg still has to encode after the last frame
+        with PROFILER.span("encode"):
+            returncode = ffmpeg.wait()
+        if returncode != 0:
+            raise RuntimeError(f"ffmpeg failed with code {returncode}")
+    except BaseException:
+        if ffmpeg is not None and ffmpeg.poll() is None:
+            ffmpeg.kill()
+            ffmpeg.wait()
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        PROFILER.stop()
+        raise
+
+    os.replace(part_path, path)
+    # There are no plays; one slice covers the whole render
+    PROFILER.slice_since("render", render_start, frames=total_frames)
+    PROFILER.save(engine="raster", scene=algo.scene, quality=quality)
+    if stats is not None:
+        # There is no scene; drawing and piping the frames is the work
+        stats.update(
+            construct_seconds=time.perf_counter() - start,
+            plays=0,
+            frames=total_frames,
+            partial_movies=0,
+        )
+    progress.emit(
+        "encode",
+        animations=math.ceil(total_frames / fps),
+        frames=total_frames,
+    )
+    progress.emit("finished", path=path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--algo", required=True)
+    parser.add_argument("--quality", default=QUALITY)
+    parser.add_argument("--media-dir", default=None)
+    args = parser.parse_args()
+
+    raw = os.environ.get(JOB_ENV)
+    options = json.loads(raw) if raw else {}
+    algo = get_algorithm(args.algo, engine="raster")
+    path = render_raster(
+        algo, args.quality, media_dir=args.media_dir, options=options
+    )
+    print(path, flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+import importlib
+import json
+import os
+import sys
+import time
+
+from sortflow.algorithms import (
+    ANIMATIONS_DIR,
+    MANIM_QUALITIES,
+    QUALITY,
+    REPO_DIR,
+)
+from sortflow.cache import _hash_file
+from sortflow.docker import JOB_ENV
+
+# Modules outside animations/ that import from there at import time
+DEPENDENT_MODULES = ("sortflow.trace", "sortflow.raster")
+# Hash of every source file as it was when the modules were imported
+_imported_sources = {}
+
+
+class RenderCancelled(Exception):
+    """Raised inside a render once its ``cancel_event`` is set."""
+
+
+def render_scene(
+    algo,
+    quality=QUALITY,
+    array=None,
+    media_dir=None,
+    options=None,
+    cancel_event=None,
+    stats=None,
+):
+    """Render ``algo`` inside the current interpreter and return the video.
+
+    This does the same as ``manim <algo.module>`` run from animations/,
+    but reuses an already imported manim, so only the first call in a
+    process pays for the import.
+
+    ``options`` is the job spec the scenes read through job_spec.py;
+    ``array`` is added to it when given. ``media_dir`` moves manim's
+    output somewhere else, which lets several jobs render at the same
+    time without writing to the same files. Setting ``cancel_event`` (a
+    threading.Event) stops the render at the next frame with
+    RenderCancelled. A ``stats`` dict is filled with what the render
+    took: ``construct_seconds``, ``plays``, ``frames`` and
+    ``partial_movies``, see bench.py.
+    Algorithms using the raster engine are handed to raster.py instead.
+    """
+    _forget_changed_modules()
+    if algo.engine == "raster":
+        from sortflow.raster import render_raster
+
+        return render_raster(
+            algo,
+            quality,
+            array=array,
+            media_dir=media_dir,
+            options=options,
+            cancel_event=cancel_event,
+            stats=stats,
+        )
+
+    from manim import tempconfig
+
+    if ANIMATIONS_DIR not in sys.path:
+        sys.path.insert(0, ANIMATIONS_DIR)
+
+    module = importlib.import_module(os.path.splitext(algo.module)[0])
+
+    options = dict(options or {})
+    if array is not None:
+        options["array"] = list(array)
+    os.environ[JOB_ENV] = json.dumps(options)
+    try:
+        with tempconfig(
+            {
+                "quality": MANIM_QUALITIES[quality],
+                "input_file": algo.source_path,
+                "media_dir": media_dir
+                or os.path.join(ANIMATIONS_DIR, "media"),
+            }
+        ):
+            scene = getattr(module, algo.scene)()
+            if cancel_event is not None:
+                _stop_on(cancel_event, scene.renderer.file_writer)
+            if stats is not None:
+                _measure(scene, stats)
+            scene.render()
+            if stats is not None:
+                stats["plays"] = scene.renderer.num_plays
+                stats["partial_movies"] = sum(
+                    1
+                    for path in scene.renderer.file_writer.partial_movie_files
+                    if path is not None
+                )
+            return str(scene.renderer.file_writer.movie_file_path)
+    finally:
+        del os.environ[JOB_ENV]
+
+
+def _forget_changed_modules():
+    """Make the next imports load the code as it is on disk now.
+
+    Most of a scene's logic lives in the helper modules, and the render
+    cache key hashes all of them, so a long-lived worker or pool process
+    must not keep rendering with copies imported before an edit. When
+    any source changed, every module from animations/ is dropped at
+    once, so none of them keeps using names from an old copy of another.
+    """
+    sources = {
+        path: _hash_file(path)
+        for path in [
+            os.path.join(ANIMATIONS_DIR, f)
+            for f in os.listdir(ANIMATIONS_DIR)
+            if f.endswith(".py") and f != "user_array.py"
+        ]
+        + [os.path.join(REPO_DIR, "sortflow", "raster.py")]
+    }
+    if sources == _imported_sources:
+        return
+    for name, module in list(sys.modules.items()):
+        path = getattr(module, "__file__", None)
+        if name in DEPENDENT_MODULES or (
+            path and os.path.dirname(os.path.abspath(path)) == ANIMATIONS_DIR
+        ):
+            del sys.modules[name]
+    _imported_sources.clear()
+    _imported_sources.update(sources)
+
+
+def _stop_on(cancel_event, writer):
+    write_frame = writer.write_frame
+
+    def cancellable_write_frame(*args, **kwargs):
+        if cancel_event.is_set():
+            raise RenderCancelled()
+        return write_frame(*args, **kwargs)
+
+    writer.write_frame = cancellable_write_frame
+
+
+def _measure(scene, stats):
+    writer = scene.renderer.file_writer
+    write_frame, construct = writer.write_frame, scene.construct
+    stats["frames"] = 0
+
+    def counting_write_frame(*args, **kwargs):
+        stats["frames"] += 1
+        return write_frame(*args, **kwargs)
+
+    def timed_construct():
+        # Includes rendering the frames, which manim does during play()
+        start = time.perf_counter()
+        construct()
+        stats["construct_seconds"] = time.perf_counter() - start
+
+    writer.write_frame = counting_write_frame
+    scene.construct = timed_construct
@@ -0,0 +1,440 @@
+"""Local HTTP render service for tools that can't drive the GUI.
+
+Run it with ``python -m sortflow serve``. It listens on 127.0.0.1 only,
+unless ``--host`` says otherwise, and never talks to anything but its
+clients, so it runs fine on a machine without network access.
+
+    POST /jobs               {"algorithm": "bubble", "array": [3, 1, 2],
+                              "quality": "480p15",
+                              "options": {"view": "bars"}}
+                             -> 202 {"id": "...", "status": "queued", ...}
+    GET  /jobs               every job the service remembers
+    GET  /jobs/<id>          status, progress and ETA of one job
+    GET  /jobs/<id>/events   its progress events as Server-Sent Events,
+                             see animations/render_events.py, after a
+                             ``started`` event once it leaves the queue
+    GET  /jobs/<id>/video    the finished MP4
+
+Jobs render in a bounded process pool with the same scenes and render
+cache as the GUI and the batch renderer. A job is named after its render
+cache key, so posting a job that is already queued or rendering joins
+it instead of rendering it again, and a video that was rendered before
+is done right away.
+"""
+
+import json
+import math
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from multiprocessing import get_context
+
+from sortflow.algorithms import (
+    ENGINES,
+    MANIM_QUALITIES,
+    QUALITY,
+    REPO_DIR,
+    VIEWS,
+    algorithm_for_job,
+)
+from sortflow.batch import _render_job
+from sortflow.cache import RenderCache
+from sortflow.jobs import (
+    DONE,
+    FAILED,
+    QUEUED,
+    RUNNING,
+    default_concurrency,
+    media_dir,
+    new_job_dir,
+    remove_job_dir,
+)
+from sortflow.progress import (
+    EventFileReader,
+    ProgressTracker,
+    new_progress_path,
+    progress_kind,
+)
+
+DEFAULT_PORT = 8765
+# Job spec settings a client may set, see animations/job_spec.py
+JOB_OPTIONS = ("view", "engine", "compact", "max_animations", "target_seconds")
+# Longest array per drawing: one mobject per cell gets slow quickly,
+# the bar view and the raster engine are made for large arrays
+MAX_ARRAY_LENGTH = 256
+MAX_BARS_LENGTH = 10000
+# Upper bounds for the options that decide how long a video gets
+MAX_ANIMATIONS = 5000
+MAX_TARGET_SECONDS = 600
+MAX_PENDING = 64  # queued jobs before new ones are turned away
+MAX_REMEMBERED = 1000  # finished jobs kept for status and video requests
+
+
+class ServiceBusy(Exception):
+    """Too many jobs are waiting already, the client should retry later."""
+
+
+class ServiceJob:
+    def __init__(self, key, algorithm, array, quality, options):
+        self.id = key[:16]
+        self.key = key
+        self.algorithm = algorithm
+        self.array = array
+        self.quality = quality
+        self.options = options
+        self.status = QUEUED
+        self.video = None
+        self.error = None
+        self.events = []  # every progress event so far
+        self.job_dir = None
+        self.reader = None
+        self.progress = ProgressTracker(
+            progress_kind(algorithm, quality, options)
+        )
+
+    @property
+    def finished(self):
+        return self.status in (DONE, FAILED)
+
+    def read_progress(self):
+        if self.reader is None:
+            return
+        for event in self.reader.read_new():
+            self.events.append(event)
+            if event["event"] == "started":
+                self.status = RUNNING
+                self.progress.started = event["time"]  # not queued time
+            else:
+                self.progress.feed(event)
+
+    def describe(self):
+        eta = None if self.finished else self.progress.eta()
+        return {
+            "id": self.id,
+            "status": self.status,
+            "algorithm": self.algorithm.slug,
+            "array": self.array,
+            "quality": self.quality,
+            "options": self.options,
+            "fraction": (
+                1.0 if self.status == DONE else self.progress.fraction()
+            ),
+            "eta_seconds": None if eta is None else round(eta, 1),
+            "video": f"/jobs/{self.id}/video" if self.status == DONE else None,
+            "error": self.error,
+        }
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def check_options(options):
+    """Raise ValueError unless every option has a sane type and range."""
+    if not isinstance(options, dict) or set(options) - set(JOB_OPTIONS):
+        raise ValueError(f"options may only set {', '.join(JOB_OPTIONS)}")
+    if options.get("view", VIEWS[0]) not in VIEWS:
+        raise ValueError(f"view must be one of {', '.join(VIEWS)}")
+    if options.get("engine", ENGINES[0]) not in ENGINES:
+        raise ValueError(f"engine must be one of {', '.join(ENGINES)}")
+    if not isinstance(options.get("compact", False), bool):
+        raise ValueError("compact must be true or false")
+    max_animations = options.get("max_animations", 1)
+    if (
+        not isinstance(max_animations, int)
+        or isinstance(max_animations, bool)
+        or not 0 < max_animations <= MAX_ANIMATIONS
+    ):
+        raise ValueError(
+            f"max_animations must be a whole number from 1 to {MAX_ANIMATIONS}"
+        )
+    target_seconds = options.get("target_seconds", 1)
+    if (
+        not is_number(target_seconds)
+        or not 0 < target_seconds <= MAX_TARGET_SECONDS
+    ):
+        raise ValueError(
+            f"target_seconds must be above 0 and at most {MAX_TARGET_SECONDS}"
+        )
+
+
+def max_array_length(options):
+    if options.get("view") == "bars" or options.get("engine") == "raster":
+        return MAX_BARS_LENGTH
+    return MAX_ARRAY_LENGTH
+
+
+def parse_request(request, cache):
+    """Check a POSTed job and return its algorithm, settings and key."""
+    if not isinstance(request, dict):
+        raise ValueError("Expected a JSON object")
+    options = request.get("options", {})
+    check_options(options)
+    array = request.get("array")
+    limit = max_array_length(options)
+    if (
+        not isinstance(array, list)
+        or not 0 < len(array) <= limit
+        or not all(is_number(v) and math.isfinite(v) for v in array)
+    ):
+        raise ValueError(
+            f"array must be a list of 1 to {limit} numbers for this view"
+        )
+    quality = request.get("quality", QUALITY)
+    if quality not in MANIM_QUALITIES:
+        raise ValueError(f"quality must be one of {sorted(MANIM_QUALITIES)}")
+    try:
+        algo = algorithm_for_job(str(request.get("algorithm")), options)
+    except KeyError as e:
+        raise ValueError(e.args[0]) from None
+    return algo, array, quality, options, cache.key(
+        algo, array, quality, **options
+    )
+
+
+def _render_service_job(algo, array, quality, job_media_dir, options):
+    # Runs in a pool process; the first event says the job left the queue
+    with open(os.path.join(REPO_DIR, options["progress"]), "a") as f:
+        f.write(json.dumps({"event": "started", "time": time.time()}) + "\n")
+    return _render_job(algo, array, quality, job_media_dir, options)
+
+
+class RenderService:
+    """Jobs by id plus the pool that renders them; thread safe.
+
+    A watcher thread reads the progress of every unfinished job, so a
+    job is reported running as soon as a pool process picks it up, even
+    when no client asks about it.
+    """
+
+    def __init__(self, jobs=None, max_pending=MAX_PENDING, cache=None):
+        # Spawned, not forked: the HTTP threads may hold locks meanwhile
+        self.pool = ProcessPoolExecutor(
+            max_workers=jobs or default_concurrency(),
+            mp_context=get_context("spawn"),
+        )
+        self.max_pending = max_pending
+        self.cache = cache or RenderCache()
+        self.jobs = OrderedDict()  # id -> ServiceJob, least recent first
+        self.lock = threading.RLock()
+        self.stopped = threading.Event()
+        threading.Thread(target=self.watch, daemon=True).start()
+
+    def watch(self):
+        while not self.stopped.wait(0.25):
+            with self.lock:
+                for job in list(self.jobs.values()):
+                    if not job.finished:
+                        job.read_progress()
+
+    def submit(self, request):
+        """Start the job ``request`` asks for, or join the same one."""
+        algo, array, quality, options, key = parse_request(
+            request, self.cache
+        )
+        with self.lock:
+            job = self.jobs.get(key[:16])
+            if job is not None and not job.finished:
+                return self.remember(job)  # the same render, share it
+            job = ServiceJob(key, algo, array, quality, options)
+            cached_video = self.cache.get(key)
+            if cached_video is not None:
+                job.status, job.video = DONE, cached_video
+                return self.remember(job)
+            pending = sum(j.status == QUEUED for j in self.jobs.values())
+            if pending >= self.max_pending:
+                raise ServiceBusy()
+
+            job.job_dir = new_job_dir(algo.slug)
+            progress_path = new_progress_path(algo.slug)
+            job.reader = EventFileReader(progress_path)
+            self.remember(job)
+
+        # Outside the lock; submitting may start pool processes
+        try:
+            future = self.pool.submit(
+                _render_service_job,
+                algo,
+                array,
+                quality,
+                media_dir(job.job_dir),
+                dict(options, progress=progress_path),
+            )
+        except RuntimeError as e:  # the pool is shutting down
+            future = Future()
+            future.set_exception(e)
+        future.add_done_callback(lambda f, job=job: self.finish(job, f))
+        return job
+
+    def remember(self, job):
+        self.jobs[job.id] = job
+        self.jobs.move_to_end(job.id)
+        while len(self.jobs) > MAX_REMEMBERED:
+            oldest = next(iter(self.jobs.values()))
+            if not oldest.finished:
+                break
+            del self.jobs[oldest.id]
+        return job
+
+    def finish(self, job, future):
+        # Runs on the pool's result thread
+        with self.lock:
+            job.read_progress()
+            try:
+                video, _ = future.result()
+                job.video = self.cache.put(job.key, video)
+                job.progress.finish()
+                job.status = DONE
+            except Exception as e:
+                job.error = repr(e)
+                job.status = FAILED
+            job.reader.remove()
+            remove_job_dir(job.job_dir)
+
+    def get(self, job_id):
+        """The job with ``job_id`` and its progress so far, or None."""
+        with self.lock:
+            job = self.jobs.get(job_id)
+            if job is not None and not job.finished:
+                job.read_progress()
+            return job
+
+    def status(self, job):
+        with self.lock:
+            return job.describe()
+
+    def events_since(self, job, index):
+        """Progress events from ``index`` on, and whether that's all."""
+        with self.lock:
+            if not job.finished:
+                job.read_progress()
+            return job.events[index:], job.finished
+
+    def list(self):
+        with self.lock:
+            return [job.describe() for job in self.jobs.values()]
+
+    def shutdown(self):
+        self.stopped.set()
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+class ServiceRequestHandler(BaseHTTPRequestHandler):
+    server_version = "SortFlow"
+
+    def send_json(self, code, payload, headers=()):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path.rstrip("/") != "/jobs":
+            self.send_json(404, {"error": "Not found"})
+            return
+        service = self.server.service
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            job = service.submit(json.loads(self.rfile.read(length)))
+        except ValueError as e:
+            self.send_json(400, {"error": str(e)})
+            return
+        except ServiceBusy:
+            self.send_json(
+                503,
+                {"error": "Too many jobs waiting, try again later"},
+                headers=[("Retry-After", "30")],
+            )
+            return
+        description = service.status(job)
+        self.send_json(200 if job.status == DONE else 202, description)
+
+    def do_GET(self):
+        service = self.server.service
+        parts = self.path.split("?", 1)[0].strip("/").split("/")
+        if parts == ["jobs"]:
+            self.send_json(200, service.list())
+            return
+        job = None
+        if parts[0] == "jobs" and len(parts) in (2, 3):
+            job = service.get(parts[1])
+        if job is None:
+            self.send_json(404, {"error": "Not found"})
+        elif len(parts) == 2:
+            self.send_json(200, service.status(job))
+        elif parts[2] == "events":
+            self.stream_events(job)
+        elif parts[2] == "video":
+            self.send_video(job)
+        else:
+            self.send_json(404, {"error": "Not found"})
+
+    def stream_events(self, job):
+        service = self.server.service
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        sent = 0
+        try:
+            while True:
+                events, finished = service.events_since(job, sent)
+                for event in events:
+                    data = json.dumps(event)
+                    self.wfile.write(f"data: {data}\n\n".encode())
+                sent += len(events)
+                if finished:
+                    status = json.dumps(service.status(job))
+                    self.wfile.write(
+                        f"event: status\ndata: {status}\n\n".encode()
+                    )
+                    return
+                self.wfile.flush()
+                time.sleep(0.25)
+        except (BrokenPipeError, ConnectionResetError):
+            pass  # the client stopped listening, the job goes on
+
+    def send_video(self, job):
+        if job.status != DONE:
+            self.send_json(409, {"error": f"Job is {job.status}"})
+            return
+        try:
+            f = open(job.video, "rb")
+        except FileNotFoundError:
+            # Evicted from the render cache; posting it again re-renders
+            self.send_json(410, {"error": "Video is gone, submit again"})
+            return
+        with f:
+            self.send_response(200)
+            self.send_header("Content-Type", "video/mp4")
+            size = os.fstat(f.fileno()).st_size
+            self.send_header("Content-Length", str(size))
+            self.end_headers()
+            try:
+                shutil.copyfileobj(f, self.wfile)
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+
+def serve(
+    host="127.0.0.1", port=DEFAULT_PORT, jobs=None, max_pending=MAX_PENDING
+):
+    service = RenderService(jobs, max_pending)
+    server = ThreadingHTTPServer((host, port), ServiceRequestHandler)
+    server.service = service
+    print(f"Render service listening on http://{host}:{port}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.shutdown()
@@ -0,0 +1,16 @@
+import sys
+
+from sortflow.algorithms import ANIMATIONS_DIR
+
+# sort_trace lives next to the scenes so manim can import it from there
+if ANIMATIONS_DIR not in sys.path:
+    sys.path.insert(0, ANIMATIONS_DIR)
+
+from sort_trace import TRACERS, replay, split_passes  # noqa: E402
+
+__all__ = ["TRACERS", "record", "replay", "split_passes"]
+
+
+def record(algo, array):
+    """Run ``algo`` on ``array`` and return its event trace."""
+    return TRACERS[algo.slug](list(array))
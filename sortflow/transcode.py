@@ -0,0 +1,171 @@
+"""Compact copies of finished renders for distribution.
+
+Manim encodes for quality, not size; flat-colored sorting animations
+shrink a lot when encoded again with a higher CRF, a slower preset, a
+lower frame rate or a smaller resolution. ``TranscodePool`` runs those
+encodes in background threads (ffmpeg does the actual work in its own
+process) and appends what every encode saved to ``transcodes.jsonl``.
+
+Settings are written like ``crf=28,preset=slow,fps=30,max_height=720``
+(see ``TranscodeSettings.parse``), which is what ``SORTFLOW_TRANSCODE``
+and ``sortflow render --transcode`` take.
+"""
+
+import hashlib
+import json
+import os
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sortflow.algorithms import REPO_DIR
+from sortflow.cache import DEFAULT_CACHE_DIR
+
+TRANSCODE_ENV = "SORTFLOW_TRANSCODE"
+DISTRIBUTION_DIR = os.path.join(REPO_DIR, "distribution")
+DEFAULT_LOG_PATH = os.path.join(DEFAULT_CACHE_DIR, "transcodes.jsonl")
+
+
+class TranscodeSettings:
+    """How to encode the compact copy; None leaves fps or size alone."""
+
+    def __init__(
+        self, codec="libx264", crf=23, preset="fast", fps=None, max_height=None
+    ):
+        self.codec = codec
+        self.crf = crf
+        self.preset = preset
+        self.fps = fps
+        self.max_height = max_height
+
+    @classmethod
+    def parse(cls, text):
+        """``"crf=28,fps=30"`` -> settings, ``"off"`` -> None.
+
+        An empty string or ``"default"`` gives the defaults.
+        """
+        text = (text or "").strip()
+        if text == "off":
+            return None
+        settings = cls()
+        if text in ("", "default"):
+            return settings
+        for item in text.split(","):
+            name, _, value = item.partition("=")
+            name = name.strip()
+            if name not in vars(settings) or not value:
+                raise ValueError(f"Bad transcode setting: {item!r}")
+            if name in ("crf", "max_height"):
+                value = int(value)
+            elif name == "fps":
+                value = float(value)
+            setattr(settings, name, value)
+        return settings
+
+    @classmethod
+    def from_env(cls):
+        """Settings from SORTFLOW_TRANSCODE, defaults when it isn't set."""
+        return cls.parse(os.environ.get(TRANSCODE_ENV, ""))
+
+    def as_dict(self):
+        return dict(vars(self))
+
+    def tag(self):
+        """Short stable name for these settings, used in file names."""
+        encoded = json.dumps(self.as_dict(), sort_keys=True).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:8]
+
+    def ffmpeg_args(self):
+        filters = []
+        if self.fps:
+            filters.append(f"fps={self.fps:g}")
+        if self.max_height:
+            # Only ever scale down; libx264 wants an even width
+            filters.append(f"scale=-2:'min(ih,{self.max_height})'")
+        args = ["-c:v", self.codec, "-crf", str(self.crf)]
+        if self.codec.startswith("libvpx"):
+            args += ["-b:v", "0"]  # otherwise CRF is only a cap
+        args += ["-preset", str(self.preset)]
+        if filters:
+            args += ["-vf", ",".join(filters)]
+        return args + ["-pix_fmt", "yuv420p", "-c:a", "copy"]
+
+
+def transcode(source, output, settings):
+    """Encode ``source`` into ``output`` and return what it saved."""
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    part_path = output + ".part"
+    start = time.perf_counter()
+    try:
+        subprocess.run(
+            ["ffmpeg", "-y", "-loglevel", "error", "-i", source]
+            + settings.ffmpeg_args()
+            + ["-movflags", "+faststart", "-f", "mp4", part_path],
+            check=True,
+        )
+    except BaseException:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+        raise
+    os.replace(part_path, output)
+    seconds = time.perf_counter() - start
+
+    input_bytes = os.path.getsize(source)
+    output_bytes = os.path.getsize(output)
+    return {
+        "source": source,
+        "output": output,
+        "settings": settings.as_dict(),
+        "input_bytes": input_bytes,
+        "output_bytes": output_bytes,
+        "saved_bytes": input_bytes - output_bytes,
+        "saved_percent": round(
+            100 * (1 - output_bytes / max(input_bytes, 1)), 1
+        ),
+        "encode_seconds": round(seconds, 3),
+        "time": time.time(),
+    }
+
+
+class TranscodePool:
+    """Runs transcodes in the background and logs their savings.
+
+    ``submit`` returns a concurrent.futures.Future of the record that
+    ``transcode`` returns, so callers can wait on it or add a callback.
+    """
+
+    def __init__(self, max_workers=None, log_path=DEFAULT_LOG_PATH):
+        # Every ffmpeg uses several cores already
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(1, (os.cpu_count() or 1) // 4),
+            thread_name_prefix="transcode",
+        )
+        self.log_path = log_path
+        self._lock = threading.Lock()
+
+    def submit(self, source, output, settings, **info):
+        """``info`` (e.g. the job or algorithm) is added to the record."""
+        return self.executor.submit(self._run, source, output, settings, info)
+
+    def _run(self, source, output, settings, info):
+        record = transcode(source, output, settings)
+        record.update(info)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.log_path), exist_ok=True)
+            with open(self.log_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+        return record
+
+    def shutdown(self, wait=True):
+        self.executor.shutdown(wait=wait, cancel_futures=not wait)
+
+
+def describe_savings(record):
+    """One line for logs, e.g. ``12.3 MB -> 1.1 MB (91% smaller) in 4.2s``."""
+    return (
+        f"{record['input_bytes'] / 1e6:.1f} MB -> "
+        f"{record['output_bytes'] / 1e6:.1f} MB "
+        f"({record['saved_percent']:g}% smaller) "
+        f"in {record['encode_seconds']:.1f}s"
+    )
@@ -0,0 +1,70 @@
+import os
+import struct
+import subprocess
+
+
+def is_complete_mp4(path):
+    """True once ``path`` is a fully written MP4 file.
+
+    ffmpeg writes the ``moov`` index last (or moves it to the front at
+    the very end with +faststart), so a file whose top-level boxes add
+    up exactly to its size and include ``moov`` is finished.
+    """
+    try:
+        size = os.path.getsize(path)
+        with open(path, "rb") as f:
+            offset = 0
+            seen_moov = False
+            while offset < size:
+                f.seek(offset)
+                header = f.read(8)
+                if len(header) < 8:
+                    return False
+                box_size, box_type = struct.unpack(">I4s", header)
+                if box_size == 1:  # 64-bit size follows the type
+                    box_size = struct.unpack(">Q", f.read(8))[0]
+                elif box_size == 0:  # box runs to the end of the file
+                    box_size = size - offset
+                if box_size < 8:
+                    return False
+                seen_moov = seen_moov or box_type == b"moov"
+                offset += box_size
+            return seen_moov and offset == size
+    except OSError:
+        return False
+
+
+def concat_videos(paths, output):
+    """Join MP4 files with the same encoding without re-encoding them.
+
+    Uses ffmpeg's concat demuxer, the same way manim joins its partial
+    movie files.
+    """
+    list_path = output + ".txt"
+    with open(list_path, "w") as f:
+        for path in paths:
+            escaped = os.path.abspath(path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    try:
+        subprocess.run(
+            [
+                "ffmpeg",
+                "-y",
+                "-loglevel",
+                "error",
+                "-f",
+                "concat",
+                "-safe",
+                "0",
+                "-i",
+                list_path,
+                "-c",
+                "copy",
+                "-movflags",
+                "+faststart",
+                output,
+            ],
+            check=True,
+        )
+    finally:
+        os.remove(list_path)
@@ -0,0 +1,178 @@
+"""Long-lived render worker with manim already imported.
+
+Run it with ``python -m sortflow.worker`` (locally, or inside the manim
+container with the repo mounted). Clients connect to the Unix socket,
+send one JSON line describing a job and get JSON lines back:
+
+    -> {"algorithm": "Bubble Sort", "quality": "1080p60",
+        "options": {"array": [3, 1, 2]}, "media_dir": ".sortflow_jobs/..."}
+    <- {"event": "started"}
+    <- {"event": "log", "text": "Animation 0 : Partial movie file written"}
+    <- {"event": "done", "path": "animations/media/videos/..."}
+
+Sending any further line (or hanging up) cancels the job; the worker
+stops at the next frame, removes the job's ``media_dir`` and answers
+``{"event": "cancelled"}`` if anyone is still listening.
+
+``media_dir`` (optional) is the folder the job writes its files to.
+It and the paths in ``done`` are relative to the repository root so they
+stay valid on the host when the worker runs inside a container. Jobs are
+rendered one after another because manim's config is process global.
+
+The worker writes (and on cancel deletes) whatever folder a job names,
+so it only takes ``media_dir`` and a ``profile`` path inside
+``.sortflow_jobs/`` and a ``progress`` path inside ``.sortflow_progress/``,
+and only the owner of the repository may connect to the socket.
+"""
+
+import argparse
+import json
+import logging
+import os
+import shutil
+import socketserver
+import threading
+import traceback
+
+from sortflow.algorithms import QUALITY, REPO_DIR, algorithm_for_job
+from sortflow.jobs import JOBS_DIR
+from sortflow.progress import PROGRESS_DIR
+from sortflow.render import RenderCancelled, render_scene
+
+SOCKET_PATH = os.path.join(REPO_DIR, ".sortflow_worker.sock")
+
+
+def inside(path, folder):
+    """``path`` resolved against the repo; it must lie inside ``folder``."""
+    root = os.path.realpath(os.path.join(REPO_DIR, folder))
+    resolved = os.path.realpath(os.path.join(REPO_DIR, path))
+    if resolved == root or os.path.commonpath([resolved, root]) != root:
+        raise ValueError(f"{path} is not inside {folder}")
+    return resolved
+
+
+class _StreamHandler(logging.Handler):
+    """Forwards manim's log records to the connected client."""
+
+    def __init__(self, send):
+        super().__init__(logging.INFO)
+        self.send = send
+
+    def emit(self, record):
+        try:
+            self.send({"event": "log", "text": record.getMessage()})
+        except OSError:
+            pass  # client went away, keep rendering anyway
+
+
+class RenderRequestHandler(socketserver.StreamRequestHandler):
+    def send(self, message):
+        try:
+            self.wfile.write((json.dumps(message) + "\n").encode("utf-8"))
+            self.wfile.flush()
+        except OSError:
+            pass  # client went away, it will not miss the answer
+
+    def watch_client(self, cancelled):
+        try:
+            self.rfile.readline()
+        except (OSError, ValueError):
+            pass  # ValueError: the handler already closed the file
+        cancelled.set()
+
+    def handle(self):
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            job = json.loads(line)
+            if not isinstance(job, dict):
+                raise ValueError("a job is a JSON object")
+            options = job.get("options", {})
+            if not isinstance(options, dict):
+                raise ValueError("options must be a JSON object")
+            algo = algorithm_for_job(job["algorithm"], options)
+            quality = job.get("quality", QUALITY)
+            media_dir = job.get("media_dir")
+            if media_dir is not None:
+                media_dir = inside(media_dir, JOBS_DIR)
+            if options.get("progress"):
+                inside(options["progress"], PROGRESS_DIR)
+            if options.get("profile"):
+                inside(options["profile"], JOBS_DIR)
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            self.send({"event": "error", "message": f"Bad job: {e!r}"})
+            return
+
+        cancelled = threading.Event()
+        threading.Thread(
+            target=self.watch_client, args=(cancelled,), daemon=True
+        ).start()
+
+        with self.server.render_lock:
+            if cancelled.is_set():  # while waiting for the previous job
+                self.send({"event": "cancelled"})
+                return
+            self.send({"event": "started"})
+            handler = _StreamHandler(self.send)
+            manim_logger = logging.getLogger("manim")
+            manim_logger.addHandler(handler)
+            try:
+                path = self.server.render(
+                    algo,
+                    quality,
+                    media_dir=media_dir,
+                    options=options,
+                    cancel_event=cancelled,
+                )
+            except RenderCancelled:
+                # Runs as root in the container, so clean up for the GUI
+                if media_dir is not None:
+                    shutil.rmtree(media_dir, ignore_errors=True)
+                self.send({"event": "cancelled"})
+                return
+            except Exception:
+                self.send(
+                    {"event": "error", "message": traceback.format_exc()}
+                )
+                return
+            finally:
+                manim_logger.removeHandler(handler)
+        self.send({"event": "done", "path": os.path.relpath(path, REPO_DIR)})
+
+
+class RenderServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, socket_path):
+        # Import manim (and everything it drags in) before the first job
+        import manim  # noqa: F401
+
+        self.render = render_scene
+        self.render_lock = threading.Lock()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, RenderRequestHandler)
+        # The container runs as root but the GUI connects as the user
+        # who owns the mounted repository; nobody else may send jobs
+        if os.geteuid() == 0:
+            owner = os.stat(REPO_DIR)
+            os.chown(socket_path, owner.st_uid, owner.st_gid)
+        os.chmod(socket_path, 0o600)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--socket", default=SOCKET_PATH)
+    args = parser.parse_args()
+
+    with RenderServer(args.socket) as server:
+        print(f"Render worker listening on {args.socket}", flush=True)
+        try:
+            server.serve_forever()
+        finally:
+            os.remove(args.socket)
+
+
+if __name__ == "__main__":
+    main()
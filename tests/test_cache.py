@@ -0,0 +1,42 @@
+from sortflow.algorithms import get_algorithm
+from sortflow.cache import RenderCache
+
+
+def write_video(path, size):
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    return str(path)
+
+
+def test_instances_share_the_index(tmp_path):
+    root = str(tmp_path / "cache")
+    first, second = RenderCache(root), RenderCache(root)
+    first.put("a", write_video(tmp_path / "a.mp4", 10))
+    second.put("b", write_video(tmp_path / "b.mp4", 10))
+    fresh = RenderCache(root)
+    assert fresh.get("a") is not None
+    assert fresh.get("b") is not None
+
+
+def test_eviction_sees_other_instances(tmp_path):
+    root = str(tmp_path / "cache")
+    first = RenderCache(root, max_bytes=25)
+    second = RenderCache(root, max_bytes=25)
+    first.put("a", write_video(tmp_path / "a.mp4", 10))
+    second.put("b", write_video(tmp_path / "b.mp4", 10))
+    first.put("c", write_video(tmp_path / "c.mp4", 10))
+    fresh = RenderCache(root, max_bytes=25)
+    assert fresh.get("a") is None
+    assert fresh.get("b") is not None and fresh.get("c") is not None
+    assert fresh.total_bytes() <= 25
+
+
+def test_key_depends_on_the_engine(tmp_path):
+    cache = RenderCache(str(tmp_path / "cache"))
+    bars = get_algorithm("Bubble Sort", view="bars")
+    raster = get_algorithm("Bubble Sort", engine="raster")
+    assert cache.key(bars, [3, 1, 2]) != cache.key(raster, [3, 1, 2])
+    # Settings can't override the engine that actually renders
+    assert cache.key(bars, [3, 1, 2], engine="raster") == cache.key(
+        bars, [3, 1, 2]
+    )
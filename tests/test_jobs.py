@@ -0,0 +1,29 @@
+from sortflow.algorithms import get_algorithm
+from sortflow.jobs import (
+    PRIORITY_BATCH,
+    PRIORITY_INTERACTIVE,
+    PRIORITY_PREVIEW,
+    JobQueue,
+    RenderJob,
+)
+
+
+def make_job(priority):
+    return RenderJob(get_algorithm("bubble"), [2, 1], {}, "480p15", priority)
+
+
+def test_move_keeps_what_the_job_is_for():
+    queue = JobQueue(max_running=1)
+    preview = queue.submit(make_job(PRIORITY_PREVIEW))
+    final = queue.submit(make_job(PRIORITY_INTERACTIVE))
+    batch = queue.submit(make_job(PRIORITY_BATCH))
+
+    queue.move(batch, -2)
+    assert queue.pending() == [batch, preview, final]
+    assert batch.background and batch.priority == PRIORITY_BATCH
+
+    queue.move(final, 1)
+    queue.move(preview, 5)
+    assert queue.pending()[-1] is preview
+    assert not final.background
+    assert preview.priority == PRIORITY_PREVIEW
@@ -0,0 +1,38 @@
+import os
+import sys
+
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "animations")
+)
+
+from segments import SegmentStore  # noqa: E402
+
+
+def write_movie(path, size):
+    with open(path, "wb") as f:
+        f.write(b"\0" * size)
+    return str(path)
+
+
+def test_fetch_copies_a_stored_segment(tmp_path):
+    store = SegmentStore(str(tmp_path / "segments"))
+    store.store("480p15/a.mp4", write_movie(tmp_path / "a.mp4", 10))
+    destination = str(tmp_path / "media" / "a.mp4")
+    assert store.fetch("480p15/a.mp4", destination)
+    assert os.path.getsize(destination) == 10
+    assert not store.fetch("480p15/a.mov", destination)
+
+
+def test_least_recently_used_segments_go_first(tmp_path):
+    root = str(tmp_path / "segments")
+    first = SegmentStore(root, max_bytes=25)
+    second = SegmentStore(root, max_bytes=25)
+    first.store("480p15/a.mp4", write_movie(tmp_path / "a.mp4", 10))
+    second.store("480p15/b.mp4", write_movie(tmp_path / "b.mp4", 10))
+    assert first.fetch("480p15/a.mp4", str(tmp_path / "out.mp4"))
+    first.store("480p15/c.mp4", write_movie(tmp_path / "c.mp4", 10))
+    assert not os.path.exists(first.path_for("480p15/b.mp4"))
+    destination = str(tmp_path / "out.mp4")
+    assert second.fetch("480p15/a.mp4", destination)
+    assert second.fetch("480p15/c.mp4", destination)
+    assert second.total_bytes() <= 25
@@ -0,0 +1,47 @@
+import pytest
+
+from sortflow.cache import RenderCache
+from sortflow.service import check_options, parse_request
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"target_seconds": "x"},
+        {"target_seconds": 1e9},
+        {"target_seconds": 0},
+        {"max_animations": 0},
+        {"max_animations": 2.5},
+        {"max_animations": True},
+        {"compact": 1},
+        {"view": "table"},
+        {"chunk": {"index": 0, "count": 2}},
+    ],
+)
+def test_bad_options_are_rejected(options):
+    with pytest.raises(ValueError):
+        check_options(options)
+
+
+def test_good_options_pass():
+    check_options(
+        {
+            "view": "bars",
+            "engine": "raster",
+            "compact": True,
+            "max_animations": 100,
+            "target_seconds": 30,
+        }
+    )
+
+
+@pytest.mark.parametrize(
+    "options, length",
+    [({}, 256), ({"view": "bars"}, 10000), ({"engine": "raster"}, 10000)],
+)
+def test_array_limit_depends_on_the_view(options, length, tmp_path):
+    cache = RenderCache(str(tmp_path))
+    request = {"algorithm": "bubble", "options": options}
+    parse_request(dict(request, array=[1] * length), cache)
+    with pytest.raises(ValueError):
+        parse_request(dict(request, array=[1] * (length + 1)), cache)
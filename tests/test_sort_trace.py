@@ -0,0 +1,51 @@
+import os
+import sys
+
+import pytest
+
+# The scenes import their helpers flat from animations/, like manim does
+sys.path.insert(
+    0, os.path.join(os.path.dirname(os.path.dirname(__file__)), "animations")
+)
+
+from sort_trace import TRACERS, chunk_bounds, replay, summarize  # noqa: E402
+
+# Same numbers as SortScene.PLAY_COSTS
+PLAY_COSTS = {"line": 2, "pointer": 1, "rearrange": 1}
+
+
+def cost(event):
+    return PLAY_COSTS.get(event[0], 0)
+
+
+@pytest.mark.parametrize("name", sorted(TRACERS))
+@pytest.mark.parametrize("array", [[3, 2, 1], [2, 1], [5, 1, 4, 2, 3]])
+@pytest.mark.parametrize("max_plays", [1, 4, 20])
+def test_summarize_small_arrays(name, array, max_plays):
+    events = TRACERS[name](array)
+    summary = summarize(events, max_plays, cost, len(array))
+    for event in summary:
+        if event[0] == "rearrange":
+            assert sorted(event[1]) == list(range(len(array)))
+    assert replay(array, summary) == sorted(array)
+
+
+@pytest.mark.parametrize("name", sorted(TRACERS))
+def test_summarize_keeps_short_traces(name):
+    events = TRACERS[name]([3, 1, 2])
+    assert summarize(events, 10_000, cost, 3) == events
+
+
+@pytest.mark.parametrize("name", sorted(TRACERS))
+@pytest.mark.parametrize("count", [1, 2, 3, 8])
+def test_chunk_bounds_cover_the_trace(name, count):
+    events = TRACERS[name]([6, 2, 5, 1, 4, 3])
+    bounds = chunk_bounds(events, count, cost)
+    assert len(bounds) == count + 1
+    assert bounds[0] == 0 and bounds[-1] == len(events)
+    assert bounds == sorted(bounds)
+    for start in bounds[1:-1]:
+        assert start == len(events) or events[start][0] in (
+            "pass",
+            "rearrange",
+        )